@@ -0,0 +1,25 @@
+import argparse
+from benchmarks.harness import run_cases, write_results, compare, CASES
+import benchmarks.cases  # registra os casos
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks do pipeline de renderizacao.")
+    parser.add_argument("filters", nargs="*", help="roda apenas os casos cujo nome contem algum destes textos")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplica o tamanho das cenas (padrao: 1)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    parser.add_argument("--compare", metavar="JSON", help="compara com resultados gravados antes")
+    parser.add_argument("--list", action="store_true", help="lista os casos e sai")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(CASES))
+        return
+    results = run_cases(args.filters, args.scale, args.repeat)
+    if args.output:
+        write_results(args.output, results, args.scale)
+    if args.compare:
+        compare(args.compare, results)
+
+if __name__ == "__main__":
+    main()
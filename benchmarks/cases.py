@@ -0,0 +1,141 @@
+import os
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from benchmarks.harness import case
+from benchmarks import scenes
+from src.Window import Window
+from src.Viewport import Viewport, project_vertices
+from src.Clipping import clip_line_cs, clip_line_lb, clip_lines_cs_batch, clip_lines_lb_batch, clip_polygon_sh, clip_bezier
+from src.Transformations import view_transform_matrix
+from src.SpatialIndex import window_bounds
+from src.Renderer import Renderer, Camera
+from src.Framebuffer import Framebuffer
+from src.OBJHandler import OBJHandler
+
+def _window():
+    return Window(-500.0, -500.0, 500.0, 500.0)
+
+def _viewport():
+    return Viewport(10, 10, 780, 780)
+
+def _n(base, scale):
+    return max(int(base * scale), 1)
+
+@case("clip.line_cs")
+def bench_clip_line_cs(scale):
+    segments = scenes.random_segments(_n(20000, scale)).tolist()
+    window = _window()
+    return len(segments), lambda: [clip_line_cs(a, b, window) for a, b in segments]
+
+@case("clip.line_lb")
+def bench_clip_line_lb(scale):
+    segments = scenes.random_segments(_n(20000, scale)).tolist()
+    window = _window()
+    return len(segments), lambda: [clip_line_lb(a, b, window) for a, b in segments]
+
+@case("clip.lines_cs_batch")
+def bench_clip_lines_cs_batch(scale):
+    segments = scenes.random_segments(_n(200000, scale))
+    window = _window()
+    return len(segments), lambda: clip_lines_cs_batch(segments, window)
+
+@case("clip.lines_lb_batch")
+def bench_clip_lines_lb_batch(scale):
+    segments = scenes.random_segments(_n(200000, scale))
+    window = _window()
+    return len(segments), lambda: clip_lines_lb_batch(segments, window)
+
+@case("clip.polygon_sh")
+def bench_clip_polygon_sh(scale):
+    wireframe = scenes.long_wireframe(_n(20000, scale))
+    window = _window()
+    return len(wireframe.world_coords), lambda: clip_polygon_sh(wireframe.world_coords, window)
+
+@case("clip.bezier")
+def bench_clip_bezier(scale):
+    segments = scenes.bezier_chain(_n(2000, scale)).get_segments()
+    window = _window()
+    return len(segments), lambda: [clip_bezier(segment, window) for segment in segments]
+
+@case("curve.bspline_points")
+def bench_bspline_points(scale):
+    curve = scenes.bspline_curve(_n(2000, scale))
+    return len(curve.world_coords) - 3, lambda: curve.generate_points(num_steps=20)
+
+@case("surface.bicubic_mesh")
+def bench_bicubic_mesh(scale):
+    surface = scenes.bicubic_surface(_n(32, scale ** 0.5))
+    return len(surface.control_points), lambda: surface.generate_mesh(full=True)
+
+@case("surface.bicubic_adaptive")
+def bench_bicubic_adaptive(scale):
+    surface = scenes.bicubic_surface(_n(32, scale ** 0.5), extent=200.0)
+    matrix = view_transform_matrix([0, 0, 500], [0, 0, 1], [0, 1, 0])
+    window, viewport = _window(), _viewport()
+    return len(surface.control_points), lambda: surface.tessellate_adaptive(matrix, window, viewport)
+
+@case("surface.bspline_mesh")
+def bench_bspline_mesh(scale):
+    side = _n(200, scale ** 0.5)
+    surface = scenes.bspline_surface(side, side)
+    return (side - 3) ** 2, lambda: surface.generate_mesh()
+
+@case("surface.bspline_mesh_executor")
+def bench_bspline_mesh_executor(scale):
+    # mesma grade do caso serial, com as faixas de patches divididas entre processos
+    # (spawn, como no GraphicsApp); a partida dos processos fica no aquecimento
+    side = _n(200, scale ** 0.5)
+    surface = scenes.bspline_surface(side, side)
+    pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+    return (side - 3) ** 2, lambda: surface.generate_mesh(pool), pool.shutdown
+
+@case("project.vertices")
+def bench_project_vertices(scale):
+    surface = scenes.bicubic_surface(_n(64, scale ** 0.5))
+    matrix = view_transform_matrix([0, 0, 500], [0, 0, 1], [0, 1, 0])
+    window, viewport = _window(), _viewport()
+    return len(surface.vertices), lambda: project_vertices(surface.vertices, matrix, window, viewport)
+
+@case("scene.query")
+def bench_scene_query(scale):
+    scene = scenes.mixed_scene(_n(20000, scale), surface_patches=2)
+    bounds = window_bounds(_window())
+    matrix = view_transform_matrix([0, 0, 500], [0, 0, 1], [0, 1, 0])
+    return len(scene), lambda: scene.query(bounds, matrix)
+
+@case("render.primitives")
+def bench_render(scale):
+    scene = scenes.mixed_scene(_n(2000, scale))
+    renderer, camera, window, viewport = Renderer(), Camera(), _window(), _viewport()
+    return len(scene), lambda: renderer.render(scene, window, viewport, camera)
+
+@case("render.framebuffer")
+def bench_framebuffer(scale):
+    scene = scenes.mixed_scene(_n(2000, scale))
+    primitives = Renderer().render(scene, _window(), Viewport(0, 0, 800, 800), Camera())
+    framebuffer = Framebuffer(800, 800)
+
+    def draw():
+        framebuffer.clear()
+        framebuffer.draw(primitives)
+    return sum(len(p.items) for p in primitives), draw
+
+def _obj_file(scale):
+    # .obj gerado em um diretorio temporario novo a cada execucao (junto com o cache
+    # que obj.cache_load cria ao lado dele): nada sobra de execucoes anteriores
+    directory = tempfile.TemporaryDirectory(prefix="benchmark_")
+    filename = os.path.join(directory.name, "scene.obj")
+    scenes.write_obj_file(filename, _n(50, scale), 4000)
+    return filename, directory.cleanup
+
+@case("obj.parse")
+def bench_obj_parse(scale):
+    filename, cleanup = _obj_file(scale)
+    return os.path.getsize(filename), lambda: OBJHandler.load_from_obj(filename), cleanup
+
+@case("obj.cache_load")
+def bench_obj_cache_load(scale):
+    filename, cleanup = _obj_file(scale)
+    OBJHandler.load_from_obj(filename, use_cache=True)
+    return os.path.getsize(filename), lambda: OBJHandler.load_from_obj(filename, use_cache=True), cleanup
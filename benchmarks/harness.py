@@ -0,0 +1,83 @@
+import gc
+import json
+import time
+import platform
+import statistics
+import subprocess
+import tracemalloc
+import numpy as np
+
+CASES = {}
+
+def case(name: str):
+    # registra uma funcao bench(scale) -> (itens, fn) ou (itens, fn, cleanup); fn() e o
+    # trecho cronometrado, itens e quantas operacoes ele faz (para ops/s) e cleanup(),
+    # se houver, roda depois das medicoes
+    def register(bench):
+        CASES[name] = bench
+        return bench
+    return register
+
+def measure(fn, repeat: int = 5, warmup: int = 1) -> dict:
+    for _ in range(warmup):
+        fn()
+    times = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    # memoria medida em uma execucao separada: o tracemalloc deixa o codigo mais lento
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"best_s": min(times), "median_s": statistics.median(times), "peak_bytes": peak, "repeat": repeat}
+
+def run_cases(names=None, scale: float = 1.0, repeat: int = 5, report=print) -> list:
+    results = []
+    for name, bench in CASES.items():
+        if names and not any(pattern in name for pattern in names):
+            continue
+        items, fn, *cleanup = bench(scale)
+        result = {"name": name, "items": items}
+        try:
+            result.update(measure(fn, repeat))
+        finally:
+            for done in cleanup:
+                done()
+        result["ops_per_sec"] = items / result["median_s"] if result["median_s"] > 0 else float("inf")
+        results.append(result)
+        if report:
+            report(f"{name:<32} {result['median_s'] * 1e3:10.2f} ms {result['ops_per_sec']:14.0f} ops/s "
+                   f"{result['peak_bytes'] / 2**20:9.2f} MiB")
+    return results
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine(), "processor": platform.processor()}
+
+def write_results(filename: str, results: list, scale: float):
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "scale": scale, "results": results}, f, indent=2)
+
+def compare(baseline_file: str, results: list, report=print):
+    # razao mediana atual / mediana de referencia por caso (> 1 e regressao)
+    with open(baseline_file, "r", encoding="utf-8") as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+    for result in results:
+        old = baseline.get(result["name"])
+        if old:
+            report(f"{result['name']:<32} {result['median_s'] / old['median_s']:6.2f}x")
@@ -0,0 +1,82 @@
+import numpy as np
+from src.DisplayFile import DisplayFile
+from src.Line import Line
+from src.Wireframe import Wireframe
+from src.BezierCurve import BezierCurve
+from src.BSpline import BSpline
+from src.BicubicSurface import BicubicSurface
+from src.BSplineSurface import BSplineSurface
+
+# geradores de cenas sinteticas: mesma semente, mesma cena
+SEED = 1234
+EXTENT = 1000.0
+
+def random_segments(n: int, extent: float = EXTENT, seed: int = SEED) -> np.ndarray:
+    # (n,2,2) segmentos curtos espalhados em [-extent, extent]^2
+    rng = np.random.default_rng(seed)
+    start = rng.uniform(-extent, extent, (n, 2))
+    return np.stack([start, start + rng.normal(0.0, extent / 10, (n, 2))], axis=1)
+
+def random_lines(n: int, extent: float = EXTENT, seed: int = SEED):
+    return [Line(f"line_{i}", [tuple(a), tuple(b)]) for i, (a, b) in enumerate(random_segments(n, extent, seed).tolist())]
+
+def long_wireframe(n: int, extent: float = EXTENT, seed: int = SEED) -> Wireframe:
+    # poligono estrelado com n vertices, metade dele fora da window padrao
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    radius = extent * rng.uniform(0.5, 1.5, n)
+    return Wireframe("wireframe", list(zip((radius * np.cos(angles)).tolist(), (radius * np.sin(angles)).tolist())))
+
+def bezier_chain(segments: int, extent: float = EXTENT, seed: int = SEED) -> BezierCurve:
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(-extent, extent, (3 * segments + 1, 2))
+    return BezierCurve("bezier", [tuple(p) for p in points.tolist()])
+
+def bspline_curve(points: int, extent: float = EXTENT, seed: int = SEED) -> BSpline:
+    rng = np.random.default_rng(seed)
+    return BSpline("bspline", [tuple(p) for p in rng.uniform(-extent, extent, (points, 2)).tolist()])
+
+def surface_grid(rows: int, cols: int, extent: float = EXTENT, seed: int = SEED) -> np.ndarray:
+    # grade (rows, cols, 3) de um terreno suave com ruido
+    rng = np.random.default_rng(seed)
+    x, y = np.meshgrid(np.linspace(-extent, extent, cols), np.linspace(-extent, extent, rows))
+    z = extent / 4 * np.sin(x / extent * 3) * np.cos(y / extent * 2) + rng.normal(0.0, extent / 50, x.shape)
+    return np.stack([x, y, z], axis=-1)
+
+def bicubic_surface(patches_per_side: int, extent: float = EXTENT, seed: int = SEED) -> BicubicSurface:
+    # patches 4x4 recortados de uma grade (3n+1)^2, como em um arquivo de patches
+    n = patches_per_side
+    grid = surface_grid(3 * n + 1, 3 * n + 1, extent, seed)
+    blocks = [grid[3 * i:3 * i + 4, 3 * j:3 * j + 4].reshape(16, 3) for i in range(n) for j in range(n)]
+    surface = BicubicSurface("bicubic")
+    surface.add_patches(np.stack(blocks))
+    return surface
+
+def bspline_surface(rows: int, cols: int, extent: float = EXTENT, seed: int = SEED) -> BSplineSurface:
+    surface = BSplineSurface("bspline_surface")
+    surface.set_control_points([[tuple(p) for p in row] for row in surface_grid(rows, cols, extent, seed).tolist()])
+    return surface
+
+def write_obj_file(filename: str, objects: int, vertices_per_object: int, seed: int = SEED):
+    # .obj com `objects` objetos, cada um com uma malha em fita de triangulos e arestas soltas
+    rng = np.random.default_rng(seed)
+    with open(filename, "w") as f:
+        base = 0
+        for k in range(objects):
+            f.write(f"o part_{k}\n")
+            vertices = rng.uniform(-EXTENT, EXTENT, (vertices_per_object, 3))
+            f.write("".join("v %.6f %.6f %.6f\n" % tuple(v) for v in vertices.tolist()))
+            idx = np.arange(base + 1, base + vertices_per_object - 1)
+            f.write("".join("f %d %d %d\n" % (a, a + 1, a + 2) for a in idx[::2].tolist()))
+            f.write("".join("l %d %d\n" % (a, a + 1) for a in idx[1::2].tolist()))
+            base += vertices_per_object
+
+def mixed_scene(lines: int = 1000, surface_patches: int = 8, seed: int = SEED) -> DisplayFile:
+    scene = DisplayFile()
+    for line in random_lines(lines, seed=seed):
+        scene.add_object(line)
+    scene.add_object(long_wireframe(max(lines // 10, 3), seed=seed))
+    scene.add_object(bezier_chain(max(lines // 100, 1), seed=seed))
+    scene.add_object(bspline_curve(max(lines // 50, 4), seed=seed))
+    scene.add_object(bicubic_surface(surface_patches, extent=EXTENT / 4, seed=seed))
+    return scene
@@ -0,0 +1,29 @@
+import argparse
+from src.BatchRender import load_scene, load_camera_path, turntable_path, render_path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Renderiza arquivos .obj sem interface grafica.")
+    parser.add_argument("obj_files", nargs="+", help="arquivos .obj carregados em uma unica cena")
+    parser.add_argument("-o", "--output", default="frames", help="diretorio das imagens (padrao: frames)")
+    parser.add_argument("--camera-path", help="JSON com a lista de quadros (vrp, vpn, vup, window, angle, d)")
+    parser.add_argument("--turntable", type=int, default=36, help="numero de quadros girando em torno da cena (padrao: 36)")
+    parser.add_argument("--size", type=int, nargs=2, default=(512, 512), metavar=("LARGURA", "ALTURA"))
+    parser.add_argument("--format", choices=("png", "ppm"), default="png")
+    parser.add_argument("--antialias", action="store_true")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrao: numero de CPUs)")
+    args = parser.parse_args(argv)
+
+    scene = None
+    if args.camera_path:
+        frames = load_camera_path(args.camera_path)
+    else:
+        scene = load_scene(args.obj_files)
+        frames = turntable_path(scene, args.turntable)
+
+    width, height = args.size
+    filenames = render_path(args.obj_files, frames, args.output, width, height,
+                            args.antialias, args.format, args.workers, scene)
+    print(f"{len(filenames)} quadros em {args.output}")
+
+if __name__ == "__main__":
+    main()
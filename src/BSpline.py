@@ -1,6 +1,7 @@
 from src.GraphicObject import GraphicObject
 from typing import List, Tuple
 import numpy as np
+from src.Tessellation import DEFAULT_TOLERANCE, wang_steps, power_to_bezier
 
 class BSpline(GraphicObject):
     def __init__(self, name: str, coordinates: List[Tuple[float, float]]):
@@ -12,7 +13,16 @@ class BSpline(GraphicObject):
             [ 1,  4,  1,  0]
         ])
 
-    def generate_points(self, num_steps: int = 10) -> List[Tuple[float, float]]:
+    def span_steps(self, scale: float, tolerance: float = DEFAULT_TOLERANCE) -> np.ndarray:
+        # passos por trecho para erro de no maximo `tolerance` pixels, dado `scale` pixels/unidade
+        points = np.asarray(self.world_coords, dtype=np.float64)
+        if len(points) < 4:
+            return np.empty(0, dtype=np.int64)
+        G = np.lib.stride_tricks.sliding_window_view(points, 4, axis=0).swapaxes(-1, -2)
+        return wang_steps(power_to_bezier(self.M_bs @ G) * scale, tolerance)
+
+    def generate_points(self, num_steps=10) -> List[Tuple[float, float]]:
+        # num_steps: inteiro para todos os trechos ou uma sequencia com um valor por trecho
         points = self.world_coords
         n = len(points)
         
@@ -20,16 +30,18 @@ class BSpline(GraphicObject):
             return []
 
         curve_points = []
-        delta = 1.0 / num_steps
-        
-        E = np.array([
-            [0,           0,           0,       1],
-            [delta**3,    delta**2,    delta,   0],
-            [6*delta**3,  2*delta**2,  0,       0],
-            [6*delta**3,  0,           0,       0]
-        ])
+        span_steps = np.broadcast_to(num_steps, (n - 3,)).tolist()
 
         for i in range(n - 3):
+            steps = span_steps[i]
+            delta = 1.0 / steps
+            E = np.array([
+                [0,           0,           0,       1],
+                [delta**3,    delta**2,    delta,   0],
+                [6*delta**3,  2*delta**2,  0,       0],
+                [6*delta**3,  0,           0,       0]
+            ])
+
             Gx = np.array([p[0] for p in points[i:i+4]])
             Gy = np.array([p[1] for p in points[i:i+4]])
 
@@ -43,7 +55,7 @@ class BSpline(GraphicObject):
             y, dy, d2y, d3y = init_y
 
             curve_points.append((x, y))
-            for _ in range(num_steps):
+            for _ in range(steps):
                 x += dx
                 dx += d2x
                 d2x += d3x
@@ -1,16 +1,57 @@
+import os
 import numpy as np
-from src.Ponto3D import Ponto3D
-from src.Objeto3D import Objeto3D
+from src.Ponto3D import points_to_array
+from src.Objeto3D import Objeto3D, grid_edges, is_affine
 from src.Transformations import translation_matrix
+from src.Tessellation import DEFAULT_TOLERANCE, power_basis, adaptive_mesh
+
+M_BS = np.array([
+    [-1,  3, -3,  1],
+    [ 3, -6,  3,  0],
+    [-3,  0,  3,  0],
+    [ 1,  4,  1,  0]
+]) * (1/6)
+
+def bspline_coefficients(grid):
+    # grade de controle (rows, cols, 3|4) -> C de cada patch local na ordem (r, c), (P, xyz, 4, 4)
+    grid = np.asarray(grid, dtype=np.float64)[:, :, :3]
+    rows, cols = grid.shape[:2]
+    if rows < 4 or cols < 4:
+        return np.empty((0, 3, 4, 4))
+    windows = np.lib.stride_tricks.sliding_window_view(grid, (4, 4), axis=(0, 1))
+    G = windows.reshape(-1, 3, 4, 4)
+    return M_BS @ G @ M_BS.T
+
+def tessellate_bspline_grid(grid, steps):
+    # kernel NumPy: grade de controle (rows, cols, 3|4) -> grade de pontos compartilhada
+    # ((rows-3)*steps+1, (cols-3)*steps+1, 3). Cada patch e avaliado em S @ C @ T.T na
+    # sua grade (steps+1)^2, como na BicubicSurface; patches vizinhos escrevem a mesma
+    # linha/coluna da borda, que fica guardada uma unica vez
+    grid = np.asarray(grid, dtype=np.float64)[:, :, :3]
+    rows, cols = grid.shape[:2]
+    if rows < 4 or cols < 4:
+        return np.empty((0, 0, 3))
+    U = power_basis(steps)
+    patch_cols = cols - 3
+    points = np.empty(((rows - 3) * steps + 1, patch_cols * steps + 1, 3))
+    # uma linha de patches por vez: o intermediario por patch nao cresce com a grade
+    for r in range(rows - 3):
+        patches = (U @ bspline_coefficients(grid[r:r + 4]) @ U.T).transpose(0, 2, 3, 1)
+        block = points[r * steps:r * steps + steps + 1]
+        block[:, :-1] = patches[:, :, :-1].transpose(1, 0, 2, 3).reshape(steps + 1, patch_cols * steps, 3)
+        block[:, -1] = patches[-1, :, -1]
+    return points
 
 class BSplineSurface(Objeto3D):
     def __init__(self, name: str):
         super().__init__(name)
         self.type = "BSpline Surface"
-        self.control_points = []
+        # grade de controle (rows, cols, 4)
+        self.control_points = np.empty((0, 0, 4))
         self.steps = 10
+        self._mesh_steps = None
 
-    def set_control_points(self, matrix_points: list):
+    def set_control_points(self, matrix_points: list, executor=None):
         rows = len(matrix_points)
         if rows < 4:
             raise ValueError(f"Grid must be at least 4x4. Rows: {rows}")
@@ -18,116 +59,47 @@ class BSplineSurface(Objeto3D):
         if cols < 4:
             raise ValueError(f"Grid must be at least 4x4. Cols: {cols}")
         
-        self.control_points = matrix_points
-        self.generate_mesh()
-
-    def generate_mesh(self):
-        self.segments = []
-        
-        Mbs = np.array([
-            [-1,  3, -3,  1],
-            [ 3, -6,  3,  0],
-            [-3,  0,  3,  0],
-            [ 1,  4,  1,  0]
-        ]) * (1/6)
-
-        rows = len(self.control_points)
-        cols = len(self.control_points[0])
-
-        for r in range(rows - 3):
-            for c in range(cols - 3):
-                local_patch = []
-                for i in range(4):
-                    local_patch.append(self.control_points[r+i][c:c+4])
-                
-                self.draw_patch_fwd_diff(local_patch, Mbs)
-
-    def draw_patch_fwd_diff(self, patch, M):
-        Gx = np.array([[p.x for p in row] for row in patch])
-        Gy = np.array([[p.y for p in row] for row in patch])
-        Gz = np.array([[p.z for p in row] for row in patch])
-
-        Cx = M @ Gx @ M.T
-        Cy = M @ Gy @ M.T
-        Cz = M @ Gz @ M.T
-
-        d = 1.0 / self.steps
-        d2 = d * d
-        d3 = d * d * d
-        
-        E = np.array([
-            [0,       0,      0,      1],
-            [d3,      d2,     d,      0],
-            [6*d3,    2*d2,   0,      0],
-            [6*d3,    0,      0,      0]
-        ])
-
-        for i in range(self.steps + 1):
-            s = i / self.steps
-            S_vec = np.array([s**3, s**2, s, 1])
-            
-            coeffs_x = S_vec @ Cx 
-            coeffs_y = S_vec @ Cy
-            coeffs_z = S_vec @ Cz
-
-            init_x = E @ coeffs_x
-            init_y = E @ coeffs_y
-            init_z = E @ coeffs_z
-
-            self.plot_curve_fwd(init_x, init_y, init_z)
-
-        for i in range(self.steps + 1):
-            t = i / self.steps
-            T_vec = np.array([t**3, t**2, t, 1])
-            
-            coeffs_x = Cx @ T_vec
-            coeffs_y = Cy @ T_vec
-            coeffs_z = Cz @ T_vec
-
-            init_x = E @ coeffs_x
-            init_y = E @ coeffs_y
-            init_z = E @ coeffs_z
-
-            self.plot_curve_fwd(init_x, init_y, init_z)
-
-    def plot_curve_fwd(self, ix, iy, iz):
-        x, dx, d2x, d3x = ix
-        y, dy, d2y, d3y = iy
-        z, dz, d2z, d3z = iz
-
-        prev_p = Ponto3D(x, y, z)
-
-        for _ in range(self.steps):
-            x += dx; dx += d2x; d2x += d3x
-            y += dy; dy += d2y; d2y += d3y
-            z += dz; dz += d2z; d2z += d3z
-
-            curr_p = Ponto3D(x, y, z)
-            self.add_segment(prev_p, curr_p)
-            prev_p = curr_p
+        self.control_points = points_to_array(
+            [p for row in matrix_points for p in row]).reshape(rows, cols, 4)
+        self.generate_mesh(executor)
+
+    def generate_mesh(self, executor=None):
+        # executor: concurrent.futures.Executor opcional, usado so nesta chamada, para
+        # tesselar faixas de patches em paralelo
+        rows = self.control_points.shape[0]
+
+        if executor is None or rows - 3 < 2:
+            points = tessellate_bspline_grid(self.control_points, self.steps)
+        else:
+            # divide as linhas de patches em faixas; faixas vizinhas compartilham 3 linhas
+            # de controle e a linha de pontos da borda, que entra so uma vez
+            num_chunks = min(rows - 3, 4 * (os.cpu_count() or 1))
+            bounds = np.linspace(0, rows - 3, num_chunks + 1).astype(int)
+            grids = [self.control_points[r0:r1 + 3] for r0, r1 in zip(bounds[:-1], bounds[1:]) if r1 > r0]
+            strips = list(executor.map(tessellate_bspline_grid, grids, [self.steps] * len(grids)))
+            points = np.concatenate([strips[0]] + [strip[1:] for strip in strips[1:]])
+
+        self.set_geometry(points.reshape(-1, 3), grid_edges(*points.shape[:2]))
+        self._mesh_steps = self.steps
+
+    def tessellate_adaptive(self, matrix, window, viewport, perspective=False, tolerance=DEFAULT_TOLERANCE):
+        # resolucao escolhida por patch a partir do tamanho projetado na tela
+        return adaptive_mesh(bspline_coefficients(self.control_points), matrix, window, viewport,
+                             perspective, tolerance)
 
     def apply_transformation(self, matrix):
-        flat_points = set()
-        for row in self.control_points:
-            for p in row:
-                flat_points.add(p)
-        
-        for p in flat_points:
-            p.apply_transform(matrix)
-        
-        self.generate_mesh()
+        matrix = np.asarray(matrix, dtype=np.float64)
+        flat = self.control_points.reshape(-1, 4)
+        flat[:] = flat @ matrix.T
+        if is_affine(matrix) and self._mesh_steps == self.steps:
+            super().apply_transformation(matrix)
+        else:
+            self.generate_mesh()
 
     def get_center(self):
-        if not self.control_points: return (0,0,0)
-        
-        sum_x = sum_y = sum_z = 0
-        count = 0
-        for row in self.control_points:
-            for p in row:
-                sum_x += p.x; sum_y += p.y; sum_z += p.z
-                count += 1
-        
-        return (sum_x/count, sum_y/count, sum_z/count)
+        if self.control_points.size == 0: return (0,0,0)
+        cx, cy, cz = self.control_points[:, :, :3].reshape(-1, 3).mean(axis=0)
+        return (float(cx), float(cy), float(cz))
 
     def transform_to_center(self, matrix):
         cx, cy, cz = self.get_center()
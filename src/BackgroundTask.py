@@ -0,0 +1,54 @@
+import threading
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class BackgroundTask:
+    # executa `work(task)` em uma thread; a UI consulta progress/done pelo root.after
+    # e chama on_done(resultado) na sua propria thread
+    def __init__(self, description: str, work, on_done=None):
+        self.description = description
+        self.on_done = on_done
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self._work = work
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = self._work(self)
+        except TaskCancelled:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
+
+    def report(self, fraction: float, message: str = ""):
+        # chamado pela thread de trabalho; tambem e o ponto de cancelamento
+        self.progress = min(max(fraction, 0.0), 1.0)
+        if message:
+            self.message = message
+        if self._cancel.is_set():
+            raise TaskCancelled()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
@@ -0,0 +1,95 @@
+import os
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.DisplayFile import DisplayFile
+from src.OBJHandler import OBJHandler
+from src.Objeto3D import Objeto3D
+from src.Window import Window
+from src.Viewport import Viewport
+from src.Renderer import Renderer, Camera
+from src.Framebuffer import Framebuffer
+
+WINDOW_MARGIN = 1.1
+
+def load_scene(obj_files) -> DisplayFile:
+    # todos os arquivos em uma unica cena, com nomes unicos (usa o cache binario)
+    scene = DisplayFile()
+    for filename in obj_files:
+        for obj in OBJHandler.load_from_obj(filename, use_cache=True).objects:
+            obj.name = scene.unique_name(obj.name)
+            scene.add_object(obj)
+    return scene
+
+def scene_bounds(scene: DisplayFile):
+    # (centro, diagonal) da caixa de todos os vertices 3D da cena
+    boxes = [obj.vertices[:, :3] for obj in scene.objects if isinstance(obj, Objeto3D) and len(obj.vertices)]
+    if not boxes:
+        return np.zeros(3), 1.0
+    lo = np.min([b.min(axis=0) for b in boxes], axis=0)
+    hi = np.max([b.max(axis=0) for b in boxes], axis=0)
+    return (lo + hi) / 2, max(float(np.linalg.norm(hi - lo)), 1e-9)
+
+def turntable_path(scene: DisplayFile, frames: int, elevation: float = 20.0, distance: float = 2.0):
+    # camera girando em torno do centro da cena, a `distance` diagonais dele
+    center, diagonal = scene_bounds(scene)
+    half = diagonal * WINDOW_MARGIN / 2
+    path = []
+    for k in range(frames):
+        azimuth = math.radians(360.0 * k / frames)
+        tilt = math.radians(elevation)
+        direction = np.array([math.sin(azimuth) * math.cos(tilt), math.sin(tilt), math.cos(azimuth) * math.cos(tilt)])
+        path.append({
+            "vrp": (center + direction * diagonal * distance).tolist(),
+            "vpn": direction.tolist(),
+            "vup": [0.0, 1.0, 0.0],
+            "window": [-half, -half, half, half],
+        })
+    return path
+
+def load_camera_path(filename: str):
+    # lista JSON de quadros: {"vrp", "vpn", "vup", "window": [xmin, ymin, xmax, ymax],
+    # "angle" (opcional), "d" (opcional, distancia do COP para perspectiva)}
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def render_frame(scene: DisplayFile, frame: dict, width: int, height: int, antialias: bool = False,
+                 renderer: Renderer = None) -> Framebuffer:
+    window = Window(*frame["window"])
+    window.set_angle(frame.get("angle", 0.0))
+    d = frame.get("d")
+    camera = Camera(frame["vrp"], frame["vpn"], frame["vup"], d is not None, d)
+    primitives = (renderer or Renderer()).render(scene, window, Viewport(0, 0, width, height), camera)
+    framebuffer = Framebuffer(width, height)
+    framebuffer.draw(primitives, antialias)
+    return framebuffer
+
+# cada processo do pool carrega a cena uma unica vez
+_worker_scene = None
+
+def _init_worker(obj_files):
+    global _worker_scene
+    _worker_scene = load_scene(obj_files)
+
+def _render_to_file(frame, filename, width, height, antialias):
+    render_frame(_worker_scene, frame, width, height, antialias).save(filename)
+    return filename
+
+def render_path(obj_files, frames, output_dir: str, width: int = 512, height: int = 512,
+                antialias: bool = False, image_format: str = "png", workers: int = None, scene=None):
+    # renderiza todos os quadros em output_dir/frame_0000.<formato>; com workers > 1
+    # os quadros sao divididos entre processos
+    os.makedirs(output_dir, exist_ok=True)
+    filenames = [os.path.join(output_dir, f"frame_{k:04d}.{image_format}") for k in range(len(frames))]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(frames) <= 1:
+        scene = scene if scene is not None else load_scene(obj_files)
+        for frame, filename in zip(frames, filenames):
+            render_frame(scene, frame, width, height, antialias).save(filename)
+        return filenames
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(list(obj_files),)) as pool:
+        n = len(frames)
+        return list(pool.map(_render_to_file, frames, filenames, [width] * n, [height] * n, [antialias] * n))
@@ -1,89 +1,115 @@
 import numpy as np
-from src.Ponto3D import Ponto3D
-from src.Objeto3D import Objeto3D
+from src.Ponto3D import Ponto3D, points_to_array
+from src.Objeto3D import Objeto3D, grid_edges, is_affine
 from src.Transformations import translation_matrix
+from src.Tessellation import M_BEZIER, DEFAULT_TOLERANCE, power_basis, adaptive_mesh
 
 class BicubicSurface(Objeto3D):
     def __init__(self, name: str):
         super().__init__(name)
         self.type = "BicubicSurface"
-        self.patches = []
+        # pontos de controle de todos os patches em um unico buffer (P,16,4)
+        self.control_points = np.empty((0, 16, 4))
         self.steps = 10
+        self._dirty = set()
+        self._mesh_steps = self.steps
+
+    @property
+    def patches(self):
+        flat = self.control_points.reshape(-1, 4)
+        return [[Ponto3D.view(flat, p * 16 + i) for i in range(16)] for p in range(len(self.control_points))]
 
     def add_patch(self, points_16: list):
         if len(points_16) != 16:
             raise ValueError("Patch incomplete")
-        self.patches.append(points_16)
-        self.generate_mesh()
-
-    def generate_mesh(self):
-        self.segments = []
-        Mb = np.array([
-            [-1,  3, -3,  1],
-            [ 3, -6,  3,  0],
-            [-3,  3,  0,  0],
-            [ 1,  0,  0,  0]
-        ])
-        
-        for patch in self.patches:
-            coords_x = np.array([p.x for p in patch]).reshape(4, 4)
-            coords_y = np.array([p.y for p in patch]).reshape(4, 4)
-            coords_z = np.array([p.z for p in patch]).reshape(4, 4)
-            
-            Cx = Mb @ coords_x @ Mb.T
-            Cy = Mb @ coords_y @ Mb.T
-            Cz = Mb @ coords_z @ Mb.T
-            
-            def eval_surface(s, t):
-                S = np.array([s**3, s**2, s, 1])
-                T = np.array([t**3, t**2, t, 1])
-                x = S @ Cx @ T.T
-                y = S @ Cy @ T.T
-                z = S @ Cz @ T.T
-                return Ponto3D(x, y, z)
-
-            for i in range(self.steps + 1):
-                s = i / self.steps
-                prev_p = eval_surface(s, 0)
-                for j in range(1, self.steps + 1):
-                    t = j / self.steps
-                    curr_p = eval_surface(s, t)
-                    self.add_segment(prev_p, curr_p)
-                    prev_p = curr_p
-            
-            for j in range(self.steps + 1):
-                t = j / self.steps
-                prev_p = eval_surface(0, t)
-                for i in range(1, self.steps + 1):
-                    s = i / self.steps
-                    curr_p = eval_surface(s, t)
-                    self.add_segment(prev_p, curr_p)
-                    prev_p = curr_p
+        self.add_patches([points_16])
+
+    def add_patches(self, patches):
+        # adiciona varios patches de uma vez e tessela apenas os novos
+        if isinstance(patches, np.ndarray):
+            points = points_to_array(patches)
+        else:
+            if any(len(patch) != 16 for patch in patches):
+                raise ValueError("Patch incomplete")
+            points = points_to_array([p for patch in patches for p in patch])
+        if len(points) % 16 != 0:
+            raise ValueError("Patch incomplete")
+        first = len(self.control_points)
+        self.control_points = np.concatenate([self.control_points, points.reshape(-1, 16, 4)])
+        self._dirty.update(range(first, len(self.control_points)))
+        self.generate_mesh(full=False)
+
+    def set_patch(self, index: int, points_16: list):
+        if len(points_16) != 16:
+            raise ValueError("Patch incomplete")
+        self.control_points[index] = points_to_array(points_16)
+        self._dirty.add(index)
+        self.generate_mesh(full=False)
+
+    def _coefficients(self, control_points=None):
+        # (P,16,4) -> C = Mb @ G @ Mb.T na base de potencias, (P, xyz, 4, 4)
+        if control_points is None:
+            control_points = self.control_points
+        G = control_points[:, :, :3].reshape(-1, 4, 4, 3).transpose(0, 3, 1, 2)
+        return M_BEZIER @ G @ M_BEZIER.T
+
+    def _tessellate(self, control_points):
+        # (P,16,4) -> grades (P, steps+1, steps+1, 3)
+        C = self._coefficients(control_points)
+        U = power_basis(self.steps)
+
+        # S @ C @ T.T avaliado na grade (steps+1)x(steps+1) inteira
+        return (U @ C @ U.T).transpose(0, 2, 3, 1)
+
+    def tessellate_adaptive(self, matrix, window, viewport, perspective=False, tolerance=DEFAULT_TOLERANCE):
+        # resolucao escolhida por patch a partir do tamanho projetado na tela
+        return adaptive_mesh(self._coefficients(), matrix, window, viewport, perspective, tolerance)
+
+    def generate_mesh(self, full: bool = True):
+        # o buffer de vertices guarda a malha de cada patch em um bloco contiguo
+        # de (steps+1)^2 linhas, indexado pelo indice do patch. Sem argumentos tudo e
+        # re-tesselado (os pontos de `patches` podem ter sido alterados por fora);
+        # com full=False, so os blocos sujos (add_patches, set_patch)
+        n = self.steps + 1
+        block = n * n
+        num_patches = len(self.control_points)
+
+        if full or self._mesh_steps != self.steps:
+            self._dirty = set(range(num_patches))
+            self.vertices = np.ones((0, 4))
+            self._mesh_steps = self.steps
+
+        cached = len(self.vertices) // block
+        if cached != num_patches:
+            grown = np.ones((num_patches * block, 4))
+            keep = min(cached, num_patches) * block
+            grown[:keep] = self.vertices[:keep]
+            self.vertices = grown
+            self._dirty.update(range(cached, num_patches))
+            edges = grid_edges(n, n)
+            offsets = (np.arange(num_patches, dtype=np.int32) * block)[:, None, None]
+            self.edges = (edges[None, :, :] + offsets).reshape(-1, 2)
+
+        if self._dirty:
+            dirty = np.array(sorted(i for i in self._dirty if i < num_patches), dtype=np.intp)
+            grids = self._tessellate(self.control_points[dirty])
+            self.vertices.reshape(num_patches, block, 4)[dirty, :, :3] = grids.reshape(len(dirty), block, 3)
+            self._dirty.clear()
 
     def apply_transformation(self, matrix):
-        points_to_transform = set()
-        for patch in self.patches:
-            for p in patch:
-                points_to_transform.add(p)
-        
-        for p in points_to_transform:
-            p.apply_transform(matrix)
-        
-        self.generate_mesh()
+        matrix = np.asarray(matrix, dtype=np.float64)
+        flat = self.control_points.reshape(-1, 4)
+        flat[:] = flat @ matrix.T
+        if is_affine(matrix) and self._mesh_steps == self.steps and not self._dirty:
+            super().apply_transformation(matrix)
+        else:
+            self.generate_mesh(full=True)
 
     def get_center(self):
-        all_points = []
-        for patch in self.patches:
-            all_points.extend(patch)
-        
-        if not all_points: return (0,0,0)
-        
-        sx = sum(p.x for p in all_points)
-        sy = sum(p.y for p in all_points)
-        sz = sum(p.z for p in all_points)
-        n = len(all_points)
-        return (sx/n, sy/n, sz/n)
-    
+        if len(self.control_points) == 0: return (0,0,0)
+        cx, cy, cz = self.control_points[:, :, :3].reshape(-1, 3).mean(axis=0)
+        return (float(cx), float(cy), float(cz))
+
     def transform_to_center(self, matrix):
         cx, cy, cz = self.get_center()
         t_origin = translation_matrix(-cx, -cy, -cz)
@@ -1,29 +1,12 @@
-import math
 import numpy as np
+from src.Viewport import wc_to_ppc, wc_to_ppc_batch, apply_affine_2d
 
 def ppc_to_wc(u, v, window):
-    xr = (u - 0.5) * window.width()
-    yr = (v - 0.5) * window.height()
-    
-    cx, cy = window.center()
-    theta = math.radians(window.angle)
-    cos_t, sin_t = math.cos(theta), math.sin(theta)
-    
-    xw = cos_t * xr - sin_t * yr + cx
-    yw = sin_t * xr + cos_t * yr + cy
-    
-    return (xw, yw)
+    (a, b, c), (d, e, f), _ = window.ppc_to_wc_matrix().tolist()
+    return (a * u + b * v + c, d * u + e * v + f)
 
-def wc_to_ppc(point, window):
-    xw, yw = point
-    cx, cy = window.center()
-    theta = math.radians(window.angle)
-    cos_t, sin_t = math.cos(-theta), math.sin(-theta)
-    xr = cos_t * (xw - cx) - sin_t * (yw - cy)
-    yr = sin_t * (xw - cx) + cos_t * (yw - cy)
-    u = (xr / window.width()) + 0.5
-    v = (yr / window.height()) + 0.5
-    return u, v
+def ppc_to_wc_batch(ppc, window):
+    return apply_affine_2d(ppc, window.ppc_to_wc_matrix())
 
 def clip_point(p, window):
     u, v = wc_to_ppc(p, window)
@@ -43,6 +26,23 @@ def compute_outcode_ppc(u, v):
         code |= TOP
     return code
 
+BOUNDS_OUTSIDE, BOUNDS_INSIDE, BOUNDS_PARTIAL = 0, 1, 2
+
+def classify_bounds(bounds, window):
+    # caixa de mundo (xmin, ymin, xmax, ymax) contra a window (rotacionada ou nao):
+    # totalmente dentro dispensa o recorte, totalmente fora dispensa o desenho
+    if bounds is None:
+        return BOUNDS_OUTSIDE
+    x_min, y_min, x_max, y_max = bounds
+    corners = [wc_to_ppc(p, window) for p in ((x_min, y_min), (x_max, y_min), (x_min, y_max), (x_max, y_max))]
+    us = [u for u, v in corners]
+    vs = [v for u, v in corners]
+    if min(us) >= 0.0 and max(us) <= 1.0 and min(vs) >= 0.0 and max(vs) <= 1.0:
+        return BOUNDS_INSIDE
+    if max(us) < 0.0 or min(us) > 1.0 or max(vs) < 0.0 or min(vs) > 1.0:
+        return BOUNDS_OUTSIDE
+    return BOUNDS_PARTIAL
+
 # cohen-sutherland
 def clip_line_cs(p1, p2, window):
     u1, v1 = wc_to_ppc(p1, window)
@@ -125,6 +125,92 @@ def clip_line_lb(p1, p2, window):
     result_p2 = ppc_to_wc(u2_clip, v2_clip, window)
     return [result_p1, result_p2]
 
+def compute_outcodes_ppc(u, v):
+    codes = np.zeros(np.shape(u), dtype=np.int8)
+    codes[u < 0.0] |= LEFT
+    codes[u > 1.0] |= RIGHT
+    codes[v < 0.0] |= BOTTOM
+    codes[v > 1.0] |= TOP
+    return codes
+
+# versoes em lote: segments (N,2,2) em WC -> (clipped (N,2,2), mask (N,))
+# linhas rejeitadas ficam com NaN em clipped e False em mask
+def clip_lines_cs_batch(segments, window):
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 2, 2)
+    ppc = wc_to_ppc_batch(segments.reshape(-1, 2), window).reshape(-1, 2, 2)
+    u1, v1 = ppc[:, 0, 0], ppc[:, 0, 1]
+    u2, v2 = ppc[:, 1, 0], ppc[:, 1, 1]
+
+    out1 = compute_outcodes_ppc(u1, v1)
+    out2 = compute_outcodes_ppc(u2, v2)
+    dead = np.zeros(len(ppc), dtype=bool)
+
+    while True:
+        active = ((out1 | out2) != 0) & ((out1 & out2) == 0) & ~dead
+        idx = np.nonzero(active)[0]
+        if len(idx) == 0:
+            break
+
+        a1, b1, a2, b2 = u1[idx], v1[idx], u2[idx], v2[idx]
+        o1 = out1[idx]
+        out = np.where(o1 != 0, o1, out2[idx])
+
+        top = (out & TOP) != 0
+        bottom = ~top & ((out & BOTTOM) != 0)
+        right = ~top & ~bottom & ((out & RIGHT) != 0)
+        horizontal = top | bottom
+
+        du, dv = a2 - a1, b2 - b1
+        degenerate = np.where(horizontal, dv == 0, du == 0)
+        edge_v = np.where(top, 1.0, 0.0)
+        edge_u = np.where(right, 1.0, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            u = np.where(horizontal, a1 + du * (edge_v - b1) / dv, edge_u)
+            v = np.where(horizontal, edge_v, b1 + dv * (edge_u - a1) / du)
+
+        dead[idx[degenerate]] = True
+        first = ~degenerate & (o1 != 0)
+        second = ~degenerate & (o1 == 0)
+
+        i = idx[first]
+        u1[i], v1[i] = u[first], v[first]
+        out1[i] = compute_outcodes_ppc(u1[i], v1[i])
+        i = idx[second]
+        u2[i], v2[i] = u[second], v[second]
+        out2[i] = compute_outcodes_ppc(u2[i], v2[i])
+
+    mask = ((out1 | out2) == 0) & ~dead
+    clipped = ppc_to_wc_batch(ppc.reshape(-1, 2), window).reshape(-1, 2, 2)
+    clipped[~mask] = np.nan
+    return clipped, mask
+
+def clip_lines_lb_batch(segments, window):
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 2, 2)
+    ppc = wc_to_ppc_batch(segments.reshape(-1, 2), window).reshape(-1, 2, 2)
+    u1, v1 = ppc[:, 0, 0], ppc[:, 0, 1]
+    du = ppc[:, 1, 0] - u1
+    dv = ppc[:, 1, 1] - v1
+
+    p = np.stack([-du, du, -dv, dv], axis=1)
+    q = np.stack([u1 - 0.0, 1.0 - u1, v1 - 0.0, 1.0 - v1], axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = q / p
+    t1 = np.maximum(np.where(p < 0, t, 0.0).max(axis=1), 0.0)
+    t2 = np.minimum(np.where(p > 0, t, 1.0).min(axis=1), 1.0)
+
+    mask = ~np.any((p == 0) & (q < 0), axis=1) & (t1 <= t2)
+
+    clipped_ppc = np.empty_like(ppc)
+    clipped_ppc[:, 0, 0] = u1 + t1 * du
+    clipped_ppc[:, 0, 1] = v1 + t1 * dv
+    clipped_ppc[:, 1, 0] = u1 + t2 * du
+    clipped_ppc[:, 1, 1] = v1 + t2 * dv
+
+    clipped = ppc_to_wc_batch(clipped_ppc.reshape(-1, 2), window).reshape(-1, 2, 2)
+    clipped[~mask] = np.nan
+    return clipped, mask
+
 # sutehrland-hogdman
 def clip_polygon_sh(polygon, window):
     if not polygon:
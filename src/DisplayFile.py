@@ -1,19 +1,131 @@
 from src.GraphicObject import GraphicObject
-from typing import List
+from src.Objeto3D import Objeto3D
+from src.SpatialIndex import GridIndex, object_bounds, segment_count, visible_boxes
+from typing import Dict, List
+import numpy as np
 
 
 class DisplayFile:
     def __init__(self):
-        self.objects: List[GraphicObject] = []
+        # indice por identidade (dict preserva a ordem de insercao) e indice por nome;
+        # nomes repetidos sao permitidos e ficam em ordem de insercao
+        self._by_id: Dict[int, GraphicObject] = {}
+        self._by_name: Dict[str, Dict[int, GraphicObject]] = {}
+        self._next_suffix: Dict[str, int] = {}
+        self._list = None
+        # culling: objetos 2D em uma grade uniforme; caixas 3D em um array testado
+        # de uma vez contra a window depois da projecao
+        self._grid = GridIndex()
+        self._boxes_3d: Dict[int, tuple] = {}
+        self._boxes_array = None
+        # segmentos de cada objeto e o total da cena (contadores do renderer)
+        self._segments: Dict[int, int] = {}
+        self.segment_total = 0
+
+    @property
+    def objects(self) -> List[GraphicObject]:
+        # lista em ordem de insercao, refeita apenas depois de uma alteracao
+        if self._list is None:
+            self._list = list(self._by_id.values())
+        return self._list
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    def __contains__(self, obj):
+        return id(obj) in self._by_id
 
     def add_object(self, obj: GraphicObject):
-        self.objects.append(obj)
+        if id(obj) in self._by_id:
+            return
+        self._by_id[id(obj)] = obj
+        self._by_name.setdefault(obj.name, {})[id(obj)] = obj
+        self._list = None
+        self.update_object(obj)
+
+    def update_object(self, obj: GraphicObject):
+        # recalcula a caixa do objeto; chamar depois de transforma-lo
+        if id(obj) not in self._by_id:
+            return
+        bounds = object_bounds(obj)
+        count = segment_count(obj)
+        self.segment_total += count - self._segments.get(id(obj), 0)
+        self._segments[id(obj)] = count
+        if isinstance(obj, Objeto3D):
+            self._boxes_3d[id(obj)] = bounds
+            self._boxes_array = None
+        else:
+            self._grid.update(id(obj), bounds)
+
+    def remove_object(self, obj: GraphicObject):
+        if self._by_id.pop(id(obj), None) is None:
+            return
+        self._unindex_name(obj, obj.name)
+        self._list = None
+        self.segment_total -= self._segments.pop(id(obj))
+        if isinstance(obj, Objeto3D):
+            del self._boxes_3d[id(obj)]
+            self._boxes_array = None
+        else:
+            self._grid.remove(id(obj))
+
+    def _unindex_name(self, obj, name):
+        same_name = self._by_name[name]
+        del same_name[id(obj)]
+        if not same_name:
+            del self._by_name[name]
+
+    def query(self, window_bounds, matrix=None, perspective: bool = False) -> List[GraphicObject]:
+        # objetos que podem aparecer em window_bounds (xmin, ymin, xmax, ymax), em ordem
+        # de insercao. Objetos 3D sao testados depois de projetados por `matrix`; sem
+        # ela, todos entram
+        keys = self._grid.query(window_bounds)
+        if self._boxes_3d:
+            if matrix is None:
+                keys.update(self._boxes_3d)
+            else:
+                box_keys, boxes = self._boxes()
+                keys.update(box_keys[visible_boxes(boxes, matrix, window_bounds, perspective)].tolist())
+        if len(keys) == len(self._by_id):
+            return self.objects
+        return [obj for key, obj in self._by_id.items() if key in keys]
+
+    def _boxes(self):
+        # (chaves, caixas (N,6)) dos objetos 3D nao vazios, refeito apenas depois de uma alteracao
+        if self._boxes_array is None:
+            keys = [key for key, box in self._boxes_3d.items() if box is not None]
+            boxes = [self._boxes_3d[key] for key in keys]
+            self._boxes_array = (np.array(keys, dtype=np.int64), np.array(boxes, dtype=np.float64).reshape(-1, 6))
+        return self._boxes_array
+
+    def segments_of(self, obj: GraphicObject) -> int:
+        return self._segments.get(id(obj), 0)
 
     def get_object_by_name(self, name: str) -> GraphicObject | None:
-        for obj in self.objects:
-            if obj.name == name:
-                return obj
-        return None
+        same_name = self._by_name.get(name)
+        return next(iter(same_name.values())) if same_name else None
+
+    def unique_name(self, name: str) -> str:
+        # name, ou name_1, name_2, ...; o proximo sufixo de cada nome e lembrado,
+        # entao importar K objetos com o mesmo nome nao refaz a busca desde _1
+        if name not in self._by_name:
+            return name
+        count = self._next_suffix.get(name, 1)
+        while f"{name}_{count}" in self._by_name:
+            count += 1
+        self._next_suffix[name] = count + 1
+        return f"{name}_{count}"
 
     def clear(self):
-        self.objects.clear()
+        self._by_id.clear()
+        self._by_name.clear()
+        self._next_suffix.clear()
+        self._list = None
+        self._grid.clear()
+        self._boxes_3d.clear()
+        self._boxes_array = None
+        self._segments.clear()
+        self.segment_total = 0
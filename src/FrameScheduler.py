@@ -0,0 +1,59 @@
+import time
+
+DEFAULT_FPS = 60
+
+
+class FrameScheduler:
+    # agrupa pedidos de redesenho: request() so marca a vista como suja e o desenho
+    # roda no maximo uma vez por intervalo de quadro, pelo root.after_idle/after
+    def __init__(self, root, draw, fps: float = DEFAULT_FPS):
+        self.root = root
+        self.draw = draw
+        self.fps = fps
+        self._dirty = False
+        self._last_frame = 0.0
+        self._requested_at = 0.0
+        # durante o desenho: tempo desde o primeiro pedido que originou este quadro
+        self.current_latency = None
+        # contadores: pedidos recebidos, quadros desenhados, pedidos absorvidos por um
+        # quadro ja agendado e quadros perdidos porque o desenho estourou o intervalo
+        self.requests = 0
+        self.frames = 0
+        self.coalesced = 0
+        self.dropped_frames = 0
+        self.last_draw_time = 0.0
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.fps
+
+    def request(self):
+        self.requests += 1
+        if self._dirty:
+            self.coalesced += 1
+            return
+        self._dirty = True
+        self._requested_at = time.perf_counter()
+        wait = self._last_frame + self.interval - time.perf_counter()
+        if wait <= 0:
+            self.root.after_idle(self._run)
+        else:
+            self.root.after(int(wait * 1000) + 1, self._run)
+
+    def _run(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        start = time.perf_counter()
+        self.current_latency = start - self._requested_at
+        try:
+            self.draw()
+        finally:
+            self.current_latency = None
+        end = time.perf_counter()
+        self._last_frame = start
+        self.frames += 1
+        self.last_draw_time = end - start
+        missed = int(self.last_draw_time / self.interval)
+        if missed > 0:
+            self.dropped_frames += missed
@@ -0,0 +1,109 @@
+import time
+from collections import deque
+
+HISTORY = 120
+# limites (ms) das faixas do histograma de tempo de quadro
+HISTOGRAM_BINS_MS = (4.0, 8.0, 16.7, 33.3, 66.7)
+
+
+class FrameStats:
+    # tempos por etapa e contadores de cada quadro, com uma janela movel dos ultimos
+    # HISTORY quadros para FPS, percentis e histograma
+    def __init__(self, history: int = HISTORY):
+        self.frames = deque(maxlen=history)
+        self.stages = {}
+        self.counters = {}
+        self.total_frames = 0
+        # contadores de segmentos (custam um recorte extra por poligono): desligados
+        # enquanto ninguem os le
+        self.detailed = True
+        self._start = None
+
+    def begin_frame(self):
+        self.stages = {}
+        self.counters = {}
+        self._start = time.perf_counter()
+
+    def end_frame(self, latency: float = None):
+        # latency: tempo desde o evento de entrada que pediu o quadro, se conhecido
+        end = time.perf_counter()
+        self.frames.append({"end": end, "total": end - self._start, "latency": latency,
+                            "stages": self.stages, "counters": self.counters})
+        self.total_frames += 1
+
+    def stage(self, name: str):
+        # `with stats.stage(nome):` soma o tempo do bloco na etapa
+        return _Stage(self.stages, name)
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def fps(self) -> float:
+        if len(self.frames) < 2:
+            return 0.0
+        span = self.frames[-1]["end"] - self.frames[0]["end"]
+        return (len(self.frames) - 1) / span if span > 0 else 0.0
+
+    def percentile(self, q: float, key: str = "total") -> float:
+        values = sorted(f[key] for f in self.frames if f[key] is not None)
+        if not values:
+            return 0.0
+        return values[min(int(q / 100.0 * len(values)), len(values) - 1)]
+
+    def histogram(self) -> dict:
+        # quantidade de quadros por faixa de tempo de quadro ("<4ms", ..., ">=66.7ms")
+        labels = [f"<{b:g}ms" for b in HISTOGRAM_BINS_MS] + [f">={HISTOGRAM_BINS_MS[-1]:g}ms"]
+        counts = dict.fromkeys(labels, 0)
+        for frame in self.frames:
+            ms = frame["total"] * 1000.0
+            index = next((i for i, b in enumerate(HISTOGRAM_BINS_MS) if ms < b), len(HISTOGRAM_BINS_MS))
+            counts[labels[index]] += 1
+        return counts
+
+    def snapshot(self) -> dict:
+        # resumo da janela: FPS, percentis, medias por etapa (s) e contadores do ultimo quadro
+        n = len(self.frames)
+        stages = {}
+        for frame in self.frames:
+            for name, seconds in frame["stages"].items():
+                stages[name] = stages.get(name, 0.0) + seconds / n
+        last = self.frames[-1] if self.frames else {"total": 0.0, "counters": {}}
+        return {
+            "frames": self.total_frames,
+            "fps": self.fps(),
+            "frame_time": {"last": last["total"], "p50": self.percentile(50), "p95": self.percentile(95),
+                           "max": max((f["total"] for f in self.frames), default=0.0)},
+            "latency": {"p50": self.percentile(50, "latency"), "p95": self.percentile(95, "latency")},
+            "stages": stages,
+            "counters": dict(last["counters"]),
+            "histogram": self.histogram(),
+        }
+
+    def summary(self) -> str:
+        # texto curto para o HUD
+        s = self.snapshot()
+        lines = [f"FPS {s['fps']:5.1f}  quadro {s['frame_time']['last'] * 1e3:6.1f} ms  "
+                 f"p95 {s['frame_time']['p95'] * 1e3:6.1f} ms  latencia p95 {s['latency']['p95'] * 1e3:6.1f} ms"]
+        lines.append("  ".join(f"{name} {seconds * 1e3:.1f}" for name, seconds in sorted(s["stages"].items())))
+        lines.append("  ".join(f"{name} {value}" for name, value in sorted(s["counters"].items())))
+        return "\n".join(lines)
+
+    def reset(self):
+        self.frames.clear()
+        self.total_frames = 0
+
+
+class _Stage:
+    # gerenciador de contexto simples (mais barato que @contextmanager: e usado por objeto)
+    __slots__ = ("stages", "name", "start")
+
+    def __init__(self, stages, name):
+        self.stages = stages
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.stages[self.name] = self.stages.get(self.name, 0.0) + time.perf_counter() - self.start
+        return False
@@ -0,0 +1,170 @@
+import struct
+import zlib
+import numpy as np
+import src.theme as theme
+
+def hex_to_rgb(color: str) -> np.ndarray:
+    color = color.lstrip("#")
+    return np.array([int(color[i:i + 2], 16) for i in (0, 2, 4)], dtype=np.float64)
+
+def clip_segments_to_rect(segments, width: int, height: int):
+    # Liang-Barsky vetorizado contra o retangulo de pixels; (N,4) -> (M,4) visiveis
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    x1, y1, x2, y2 = segments.T
+    dx, dy = x2 - x1, y2 - y1
+    t0 = np.zeros(len(segments))
+    t1 = np.ones(len(segments))
+    keep = np.ones(len(segments), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in ((-dx, x1 + 0.5), (dx, width - 0.5 - x1), (-dy, y1 + 0.5), (dy, height - 0.5 - y1)):
+            keep &= ~((p == 0) & (q < 0))
+            r = q / p
+            t0 = np.where(p < 0, np.maximum(t0, r), t0)
+            t1 = np.where(p > 0, np.minimum(t1, r), t1)
+    keep &= t0 <= t1
+    t0, t1 = t0[keep, None], t1[keep, None]
+    start, delta = segments[keep, :2], (segments[keep, 2:] - segments[keep, :2])
+    return np.hstack([start + t0 * delta, start + t1 * delta])
+
+def polyline_segments(polylines) -> np.ndarray:
+    # poligonais [x1, y1, x2, y2, ...] ou [(x1, y1), (x2, y2), ...] -> segmentos (N,4)
+    if all(len(item) == 4 and not isinstance(item[0], (tuple, list)) for item in polylines):
+        # caso comum (arestas soltas): um unico array (N,4)
+        return np.asarray(polylines, dtype=np.float64).reshape(-1, 4)
+    segments = [np.empty((0, 4))]
+    for polyline in polylines:
+        xy = np.asarray(polyline, dtype=np.float64).reshape(-1, 2)
+        if len(xy) >= 2:
+            segments.append(np.hstack([xy[:-1], xy[1:]]))
+    return np.concatenate(segments)
+
+
+class Framebuffer:
+    # imagem uint8 (altura, largura, 3) com rasterizacao vetorizada de lotes de segmentos
+    def __init__(self, width: int, height: int, background: str = theme.CANVAS_BG):
+        self.width = width
+        self.height = height
+        self.background = background
+        self.pixels = np.empty((height, width, 3), dtype=np.uint8)
+        self.clear()
+
+    def clear(self):
+        self.pixels[:] = hex_to_rgb(self.background).astype(np.uint8)
+
+    def _blend(self, ys, xs, coverage, color):
+        # cobertura maxima por pixel, depois uma unica mistura com a cor. A cobertura e
+        # quantizada em 8 bits: a ordenacao estavel de uint8 e um radix sort, e escrevendo
+        # em ordem crescente a ultima escrita (a maior) vence
+        flat = self.pixels.reshape(-1, 3)
+        index = ys * self.width + xs
+        rgb = hex_to_rgb(color)
+        if np.all(coverage >= 1.0):
+            flat[index] = rgb.astype(np.uint8)
+            return
+        level = np.rint(coverage * 255).astype(np.uint8)
+        order = np.argsort(level, kind="stable")
+        alpha = np.zeros(len(flat), dtype=np.uint8)
+        alpha[index[order]] = level[order]
+        touched = np.flatnonzero(alpha)
+        a = alpha[touched][:, None] / 255.0
+        flat[touched] = np.rint(flat[touched] * (1.0 - a) + rgb * a).astype(np.uint8)
+
+    def draw_lines(self, segments, color: str, width: int = 1, antialias: bool = False):
+        # DDA sobre todos os segmentos (N,4) de uma vez: uma amostra por coluna (ou linha)
+        # de pixels do eixo dominante; com antialias a cobertura e dividida entre os dois
+        # pixels vizinhos no eixo secundario (como no algoritmo de Wu)
+        segments = clip_segments_to_rect(segments, self.width, self.height)
+        if len(segments) == 0:
+            return
+        x_major = np.abs(segments[:, 2] - segments[:, 0]) >= np.abs(segments[:, 3] - segments[:, 1])
+        major_1 = np.where(x_major, segments[:, 0], segments[:, 1])
+        major_2 = np.where(x_major, segments[:, 2], segments[:, 3])
+        minor_1 = np.where(x_major, segments[:, 1], segments[:, 0])
+        minor_2 = np.where(x_major, segments[:, 3], segments[:, 2])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = np.where(major_2 != major_1, (minor_2 - minor_1) / (major_2 - major_1), 0.0)
+
+        start = np.floor(major_1 + 0.5).astype(np.int64)
+        end = np.floor(major_2 + 0.5).astype(np.int64)
+        direction = np.where(end >= start, 1, -1)
+        steps = np.abs(end - start) + 1
+        owner = np.repeat(np.arange(len(segments)), steps)
+        first = np.cumsum(steps) - steps
+        major = start[owner] + (np.arange(len(owner)) - first[owner]) * direction[owner]
+        minor = minor_1[owner] + (major - major_1[owner]) * slope[owner]
+        x_major = x_major[owner]
+        offsets = np.arange(width) - (width - 1) // 2
+
+        if antialias:
+            base = np.floor(minor).astype(np.int64)
+            frac = minor - base
+            minors = [base + o for o in offsets] + [base + offsets[-1] + 1]
+            coverages = [1.0 - frac] + [np.ones_like(frac)] * (width - 1) + [frac]
+        else:
+            base = np.floor(minor + 0.5).astype(np.int64)
+            minors = [base + o for o in offsets]
+            coverages = [np.ones_like(minor)] * width
+
+        major = np.concatenate([major] * len(minors))
+        minor = np.concatenate(minors)
+        coverage = np.concatenate(coverages)
+        x_major = np.concatenate([x_major] * len(minors))
+        xs = np.where(x_major, major, minor)
+        ys = np.where(x_major, minor, major)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height) & (coverage > 0)
+        self._blend(ys[inside], xs[inside], coverage[inside], color)
+
+    def draw_points(self, centers, radius: float, color: str, antialias: bool = False):
+        # discos de raio `radius` (splats) em todos os centros (N,2) de uma vez
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        r = int(np.ceil(radius)) + 1
+        oy, ox = np.mgrid[-r:r + 1, -r:r + 1]
+        xs = np.rint(centers[:, 0, None]).astype(np.int64) + ox.ravel()
+        ys = np.rint(centers[:, 1, None]).astype(np.int64) + oy.ravel()
+        distance = np.hypot(xs - centers[:, 0, None], ys - centers[:, 1, None])
+        if antialias:
+            coverage = np.clip(radius + 0.5 - distance, 0.0, 1.0)
+        else:
+            coverage = (distance <= radius).astype(np.float64)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height) & (coverage > 0)
+        self._blend(ys[inside], xs[inside], coverage[inside], color)
+
+    def draw(self, primitives, antialias: bool = False):
+        # backend de framebuffer do Renderer: primitivas com o mesmo estilo sao
+        # rasterizadas em um unico lote
+        lines, points = {}, {}
+        for primitive in primitives:
+            color = primitive.style.get("fill", theme.FG_COLOR)
+            if primitive.kind == "ovals":
+                boxes = np.asarray(primitive.items, dtype=np.float64).reshape(-1, 4)
+                radius = float(boxes[0, 2] - boxes[0, 0]) / 2
+                points.setdefault((color, radius), []).append((boxes[:, :2] + boxes[:, 2:]) / 2)
+            else:
+                width = int(primitive.style.get("width", 1))
+                lines.setdefault((color, width), []).append(polyline_segments(primitive.items))
+        for (color, width), segments in lines.items():
+            self.draw_lines(np.concatenate(segments), color, width, antialias)
+        for (color, radius), centers in points.items():
+            self.draw_points(np.concatenate(centers), radius, color, antialias)
+
+    def save_ppm(self, stream):
+        stream.write(b"P6\n%d %d\n255\n" % (self.width, self.height))
+        stream.write(self.pixels.tobytes())
+
+    def save_png(self, stream, level: int = 6):
+        # PNG RGB 8 bits sem dependencias: cada linha com filtro 0, um unico IDAT
+        def chunk(kind, data):
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+        rows = np.hstack([np.zeros((self.height, 1), dtype=np.uint8), self.pixels.reshape(self.height, -1)])
+        stream.write(b"\x89PNG\r\n\x1a\n")
+        stream.write(chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)))
+        stream.write(chunk(b"IDAT", zlib.compress(rows.tobytes(), level)))
+        stream.write(chunk(b"IEND", b""))
+
+    def save(self, filename: str):
+        # formato pela extensao: .png ou .ppm
+        with open(filename, "wb") as f:
+            if filename.lower().endswith(".png"):
+                self.save_png(f)
+            else:
+                self.save_ppm(f)
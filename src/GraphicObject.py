@@ -6,12 +6,23 @@ class GraphicObject:
         self.name = name
         self.type = obj_type
         self.world_coords = coordinates
+        self._bounds = None
     
     def get_points(self):
         return self.world_coords
 
     def set_points(self, points):
         self.world_coords = points
+        self._bounds = None
+
+    def get_bounds(self):
+        # caixa (xmin, ymin, xmax, ymax) em coordenadas de mundo, ou None sem pontos;
+        # guardada ate set_points/apply_transformation
+        if self._bounds is None and self.world_coords:
+            xs = [x for x, y in self.world_coords]
+            ys = [y for x, y in self.world_coords]
+            self._bounds = (min(xs), min(ys), max(xs), max(ys))
+        return self._bounds
     
     def apply_transformation(self, matrix):
         new_points = []
@@ -20,6 +31,7 @@ class GraphicObject:
             res = np.dot(matrix, vec)
             new_points.append((res[0], res[1]))
         self.world_coords = new_points
+        self._bounds = None
     
     def get_center(self):
         points = self.get_points()
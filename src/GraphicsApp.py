@@ -2,7 +2,7 @@ import tkinter as tk
 from src.BSplineSurface import BSplineSurface
 from tkinter import ttk, messagebox, filedialog
 from src.Window import Window
-from src.Viewport import Viewport, transform_coordinates
+from src.Viewport import Viewport
 from src.DisplayFile import DisplayFile
 from src.Line import Line
 from src.Point import Point
@@ -13,11 +13,24 @@ from src.ObjectCreationWindow import ObjectCreationWindow
 import src.theme as theme
 from src.Transformations import *
 from src.OBJHandler import OBJHandler
-from src.Clipping import *
 from src.Objeto3D import Objeto3D
 from src.Ponto3D import Ponto3D
 from src.BicubicSurface import BicubicSurface
-import numpy as np
+from src.Tessellation import DEFAULT_TOLERANCE
+from src.BackgroundTask import BackgroundTask
+from src.RetainedCanvas import RetainedCanvas
+from src.FrameScheduler import FrameScheduler
+from src.Renderer import Renderer, Camera
+from src.FrameStats import FrameStats
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+
+TASK_POLL_MS = 100
+# superficies B-spline com pelo menos esse numero de patches (uma grade 200x200) sao
+# tesseladas em segundo plano; abaixo disso a partida do pool custa mais que a tesselagem
+BSPLINE_TASK_PATCHES = 197 * 197
+TARGET_FPS = 60
 
 class GraphicsApp:
     def __init__(self, root: tk.Tk):
@@ -75,6 +88,18 @@ class GraphicsApp:
         ttk.Entry(dist_row, textvariable=self.cop_dist_var, width=8).pack(side=tk.LEFT)
         ttk.Button(dist_row, text="Set", command=self.redraw).pack(side=tk.LEFT, padx=5)
 
+        ttk.Label(self.controls_frame, text="Tesselação:").pack(fill=tk.X, pady=(10, 5))
+        self.use_adaptive = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.controls_frame, text="Adaptativa", variable=self.use_adaptive, command=self.redraw).pack(anchor="w")
+        ttk.Label(self.controls_frame, text="Tolerância (px):").pack(fill=tk.X, pady=(5, 0))
+        self.tolerance_var = tk.StringVar(value=str(DEFAULT_TOLERANCE))
+        tol_row = ttk.Frame(self.controls_frame); tol_row.pack(fill=tk.X)
+        ttk.Entry(tol_row, textvariable=self.tolerance_var, width=8).pack(side=tk.LEFT)
+        ttk.Button(tol_row, text="Set", command=self.redraw).pack(side=tk.LEFT, padx=5)
+
+        self.show_hud = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.controls_frame, text="HUD de desempenho (F3)", variable=self.show_hud, command=self.redraw).pack(anchor="w", pady=(10, 0))
+
         ttk.Label(self.controls_frame, text="Algoritmo de Clipping (Linhas):").pack(fill=tk.X, pady=(10, 5))
         self.line_clip_alg = tk.StringVar(value="CS")
         ttk.Radiobutton(self.controls_frame, text="Cohen-Sutherland", variable=self.line_clip_alg, value="CS").pack(anchor="w")
@@ -92,6 +117,11 @@ class GraphicsApp:
             highlightbackground=theme.BORDER_COLOR
         )
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.layer = RetainedCanvas(self.canvas)
+        # eventos de entrada (arrastar, zoom, teclas) pedem um quadro; rajadas de
+        # eventos resultam em no maximo um redesenho por intervalo de quadro
+        self.scheduler = FrameScheduler(self.root, self.redraw, fps=TARGET_FPS)
+        self.frame_stats = FrameStats()
 
         ttk.Label(self.controls_frame, text="Nome do Objeto:").pack(fill=tk.X, pady=(0, 5))
         self.obj_name_var = tk.StringVar()
@@ -121,6 +151,15 @@ class GraphicsApp:
         self.clear_button = ttk.Button(self.controls_frame, text="Limpar Cena", command=self.clear_scene)
         self.clear_button.pack(fill=tk.X, pady=5)
 
+        # importacoes em segundo plano: progresso consultado pelo root.after
+        self.tasks = []
+        self._process_pool = None
+        self.task_var = tk.StringVar(value="")
+        task_row = ttk.Frame(self.controls_frame); task_row.pack(fill=tk.X, pady=(10, 0))
+        ttk.Label(task_row, textvariable=self.task_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.cancel_button = ttk.Button(task_row, text="Cancelar", command=self.cancel_tasks, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.RIGHT)
+
         info_text = "Navegação 3D:\nWASD, QE"
         ttk.Label(self.controls_frame, text=info_text, justify=tk.LEFT).pack(fill=tk.X, pady=(20, 0))
 
@@ -150,6 +189,8 @@ class GraphicsApp:
         self.root.bind("<q>", lambda e: self.move_camera(0, 0, 50))
         self.root.bind("<e>", lambda e: self.move_camera(0, 0, -50))
 
+        self.root.bind("<F3>", lambda e: (self.show_hud.set(not self.show_hud.get()), self.redraw()))
+
         self.canvas.bind("<MouseWheel>", self.zoom_window)
         self.canvas.bind("<Button-4>", lambda e: self.zoom_window(e, 0.9))
         self.canvas.bind("<Button-5>", lambda e: self.zoom_window(e, 1.1))
@@ -158,6 +199,7 @@ class GraphicsApp:
         self.canvas.bind("<B1-Motion>", lambda e: self.on_mouse_drag(e))
         self.canvas.bind("<ButtonRelease-1>", lambda e: self.on_mouse_release(e))
         self._drag_data = {"x": 0, "y": 0}
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
 
         self.redraw()
 
@@ -165,7 +207,7 @@ class GraphicsApp:
         self.vrp[0] += dx
         self.vrp[1] += dy
         self.vrp[2] += dz
-        self.redraw()
+        self.scheduler.request()
 
     def add_object(self):
         name = self.obj_name_var.get().strip()
@@ -196,12 +238,7 @@ class GraphicsApp:
                 points_3d = [Ponto3D(x, y, z) for x, y, z in coords]
                 obj.add_patch(points_3d)
             elif obj_type == "BSpline Surface":
-                obj = BSplineSurface(name)
-                matrix_p3d = []
-                for row in coords:
-                    matrix_row = [Ponto3D(x, y, z) for x, y, z in row]
-                    matrix_p3d.append(matrix_row)
-                obj.set_control_points(matrix_p3d)
+                self.add_bspline_surface(name, coords)
             if obj:
                 self.display_file.add_object(obj)
                 self.objects_listbox.insert(tk.END, f"{obj.name} ({obj.type})")
@@ -209,13 +246,14 @@ class GraphicsApp:
 
     def clear_scene(self):
         self.display_file.clear()
+        self.layer.clear()
         self.objects_listbox.delete(0, tk.END)
         self.redraw()
 
     def move_window(self, dx_local: float, dy_local: float):
         move_factor = 0.05
         self.window.move_local(self.window.width() * move_factor * (dx_local / 50), self.window.height() * move_factor * (-dy_local / 50))
-        self.redraw()
+        self.scheduler.request()
 
     def zoom_window(self, event, factor=None):
         if factor is None:
@@ -224,97 +262,56 @@ class GraphicsApp:
             else:
                 factor = 1.1
         self.window.zoom(factor)
-        self.redraw()
+        self.scheduler.request()
 
-    def redraw(self):
-        self.canvas.delete("all")
-        
-        view_mat = view_transform_matrix(self.vrp, self.vpn, self.vup)
-        
+    def camera(self) -> Camera:
+        d = None
         if self.use_perspective.get():
             try:
                 d = float(self.cop_dist_var.get())
-                if d == 0: d = 1.0
-                persp_mat = perspective_matrix(d)
-                full_mat = persp_mat @ view_mat
             except ValueError:
-                full_mat = view_mat
-        else:
-            full_mat = view_mat
-
-        for obj in self.display_file.objects:
-            if isinstance(obj, Objeto3D):
-                screen_segments = []
-                for p1, p2 in obj.segments:
-                    p1_prime = full_mat @ p1.coords
-                    p2_prime = full_mat @ p2.coords
-                    
-                    if self.use_perspective.get():
-                        if p1_prime[3] != 0: p1_prime = p1_prime / p1_prime[3]
-                        if p2_prime[3] != 0: p2_prime = p2_prime / p2_prime[3]
-                    
-                    sc1 = transform_coordinates((p1_prime[0], p1_prime[1]), self.window, self.viewport)
-                    sc2 = transform_coordinates((p2_prime[0], p2_prime[1]), self.window, self.viewport)
-                    self.canvas.create_line(sc1, sc2, fill=theme.WIREFRAME_COLOR, width=2)
-                continue
+                pass
+        return Camera(self.vrp, self.vpn, self.vup, self.use_perspective.get(), d)
 
-            clipped = None
-            if obj.type == "Point":
-                if clip_point(obj.world_coords[0], self.window):
-                    clipped = [obj.world_coords[0]]
+    def renderer(self) -> Renderer:
+        try:
+            tolerance = float(self.tolerance_var.get())
+            if tolerance <= 0: tolerance = DEFAULT_TOLERANCE
+        except ValueError:
+            tolerance = DEFAULT_TOLERANCE
+        return Renderer(self.line_clip_alg.get(), self.use_adaptive.get(), tolerance, stats=self.frame_stats)
 
-            elif obj.type == "Line":
-                if self.line_clip_alg.get() == "CS":
-                    clipped = clip_line_cs(obj.world_coords[0], obj.world_coords[1], self.window)
-                else:
-                    clipped = clip_line_lb(obj.world_coords[0], obj.world_coords[1], self.window)
-
-            elif obj.type == "Wireframe":
-                clipped = clip_polygon_sh(obj.world_coords, self.window)
-
-            elif obj.type == "Bezier Curve":
-                clipped_segments = []
-                for segment in obj.get_segments():
-                    clipped_segments.extend(clip_bezier(segment, self.window))
-                if clipped_segments:
-                    screen_coords = []
-                    for segment in clipped_segments:
-                        points_to_draw = []
-                        for t in np.linspace(0, 1, 100):
-                            points_to_draw.append(de_casteljau(segment, t))
-                        screen_coords.extend([transform_coordinates(p, self.window, self.viewport) for p in points_to_draw])
-                    if len(screen_coords) >= 2:
-                        self.canvas.create_line(screen_coords, fill=theme.BEZIER_COLOR, width=2)
-
-            elif obj.type == "BSpline":
-                curve_points = obj.generate_points(num_steps=20) 
-                for i in range(len(curve_points) - 1):
-                    p1 = curve_points[i]
-                    p2 = curve_points[i+1]
-                    segment_clipped = None
-                    if self.line_clip_alg.get() == "CS":
-                        segment_clipped = clip_line_cs(p1, p2, self.window)
-                    else:
-                        segment_clipped = clip_line_lb(p1, p2, self.window)
-                    if segment_clipped:
-                        sc = [transform_coordinates(p, self.window, self.viewport) for p in segment_clipped]
-                        if len(sc) >= 2:
-                            self.canvas.create_line(sc, fill=theme.BSPLINE_COLOR, width=2)
-
-            if clipped:
-                if obj.type != "Bezier Curve":
-                    screen_coords = [transform_coordinates(p, self.window, self.viewport) for p in clipped]
-                    if obj.type == "Point":
-                        for x, y in screen_coords:
-                            self.canvas.create_oval(x - 2, y - 2, x + 2, y + 2, fill=theme.POINT_COLOR, outline=theme.POINT_COLOR)
-                    elif obj.type == "Line":
-                        if len(screen_coords) >= 2:
-                            self.canvas.create_line(screen_coords, fill=theme.LINE_COLOR, width=2)
-                    elif obj.type == "Wireframe":
-                        if len(screen_coords) >= 2:
-                            for i in range(len(screen_coords)):
-                                next_i = (i + 1) % len(screen_coords)
-                                self.canvas.create_line(screen_coords[i][0], screen_coords[i][1], screen_coords[next_i][0], screen_coords[next_i][1], fill=theme.WIREFRAME_COLOR, width=2)
+    def redraw(self):
+        stats = self.frame_stats
+        stats.begin_frame()
+        # os contadores de segmentos so aparecem no HUD
+        stats.detailed = self.show_hud.get()
+        primitives = self.renderer().render(self.display_file, self.window, self.viewport, self.camera())
+        with stats.stage("canvas"):
+            self.layer.draw(primitives)
+        stats.end_frame(self.scheduler.current_latency)
+        self._draw_hud()
+
+    def _draw_hud(self):
+        # texto sobre o canvas (um unico item, atualizado a cada quadro) com os tempos
+        # e contadores do ultimo quadro
+        if not self.show_hud.get():
+            self.canvas.delete("hud")
+            return
+        text = self.frame_stats.summary()
+        text += f"\nquadros agrupados {self.scheduler.coalesced}  perdidos {self.scheduler.dropped_frames}"
+        if not self.canvas.find_withtag("hud"):
+            self.canvas.create_text(14, 14, anchor="nw", fill=theme.FG_COLOR, font=("TkFixedFont", 9), tags=("hud",))
+        self.canvas.itemconfigure("hud", text=text)
+        self.canvas.tag_raise("hud")
+
+    def stats(self) -> dict:
+        # tempos por etapa, contadores, FPS/percentis/histograma e contadores do agendador;
+        # os contadores de segmentos so sao medidos com o HUD ligado
+        snapshot = self.frame_stats.snapshot()
+        snapshot["scheduler"] = {"requests": self.scheduler.requests, "frames": self.scheduler.frames,
+                                 "coalesced": self.scheduler.coalesced, "dropped_frames": self.scheduler.dropped_frames}
+        return snapshot
 
     def on_mouse_press(self, event):
         self._drag_data["x"] = event.x
@@ -329,7 +326,7 @@ class GraphicsApp:
         dx_local_wc = -dx * (self.window.width()  / self.viewport.width())
         dy_local_wc =  dy * (self.window.height() / self.viewport.height())
         self.window.move_local(dx_local_wc, dy_local_wc)
-        self.redraw()
+        self.scheduler.request()
 
     def on_mouse_release(self, event):
         self.canvas.config(cursor="arrow")
@@ -356,6 +353,7 @@ class GraphicsApp:
                     dx_wc = cos(theta) * dx_local - sin(theta) * dy_local
                     dy_wc = sin(theta) * dx_local + cos(theta) * dy_local
                     obj.apply_transformation(translation_matrix(dx_wc, dy_wc))
+                self.display_file.update_object(obj)
                 self.redraw()
                 top.destroy()
             except ValueError:
@@ -385,6 +383,7 @@ class GraphicsApp:
                     transforms = [('scale', (sx, sy))]
                     matrix = build_transformation_matrix(transforms, center=obj.get_center())
                     obj.apply_transformation(matrix)
+                self.display_file.update_object(obj)
                 self.redraw()
                 top.destroy()
             except ValueError:
@@ -420,6 +419,7 @@ class GraphicsApp:
                     transforms = [('rotate', angle)]
                     matrix = build_transformation_matrix(transforms, center=obj.get_center())
                     obj.apply_transformation(matrix)
+                self.display_file.update_object(obj)
                 self.redraw()
                 top.destroy()
             except ValueError:
@@ -450,29 +450,107 @@ class GraphicsApp:
         except ValueError:
             messagebox.showerror("Erro", "Ângulo inválido.")
     
+    def _parse_executor(self):
+        # processos (spawn, sem herdar o estado do Tk) para arquivos grandes; o
+        # parsing nao disputa o GIL com a interface
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        return self._process_pool
+
+    def start_task(self, description: str, work, on_done):
+        # work(task) roda fora da thread do Tk e so pode chamar task.report;
+        # on_done(resultado) roda na thread do Tk quando a tarefa termina
+        task = BackgroundTask(description, work, on_done)
+        self.tasks.append(task.start())
+        if len(self.tasks) == 1:
+            self.root.after(TASK_POLL_MS, self._poll_tasks)
+        self._update_task_status()
+        return task
+
+    def cancel_tasks(self):
+        for task in self.tasks:
+            task.cancel()
+        self._update_task_status()
+
+    def close(self):
+        # os processos do pool nao podem sobreviver a janela nem segurar a saida do interpretador
+        self.cancel_tasks()
+        if self._process_pool is not None:
+            self._process_pool.shutdown(cancel_futures=True)
+            self._process_pool = None
+        self.root.destroy()
+
+    def _poll_tasks(self):
+        for task in [t for t in self.tasks if t.done]:
+            self.tasks.remove(task)
+            if task.cancelled:
+                continue
+            if task.error is not None:
+                messagebox.showerror("Erro", f"{task.description}: falhou\n{task.error}")
+                continue
+            task.on_done(task.result)
+        self._update_task_status()
+        if self.tasks:
+            self.root.after(TASK_POLL_MS, self._poll_tasks)
+
+    def _update_task_status(self):
+        if not self.tasks:
+            self.task_var.set("")
+            self.cancel_button.config(state=tk.DISABLED)
+            return
+        task = self.tasks[0]
+        status = "cancelando..." if task.cancelled else f"{task.progress:.0%} {task.message}"
+        more = f" (+{len(self.tasks) - 1})" if len(self.tasks) > 1 else ""
+        self.task_var.set(f"{task.description}: {status}{more}")
+        self.cancel_button.config(state=tk.NORMAL)
+
+    def _add_imported(self, obj):
+        obj.name = self.display_file.unique_name(obj.name)
+        self.display_file.add_object(obj)
+        self.objects_listbox.insert(tk.END, f"{obj.name} ({obj.type})")
+
+    def add_bspline_surface(self, name: str, coords):
+        # grades pequenas sao tesseladas na hora; a partir de BSPLINE_TASK_PATCHES patches
+        # a tesselagem sai da thread do Tk e, com mais de uma CPU, as faixas de patches
+        # sao divididas entre os processos do pool
+        points = [[Ponto3D(x, y, z) for x, y, z in row] for row in coords]
+        obj = BSplineSurface(name)
+        if (len(coords) - 3) * (len(coords[0]) - 3) < BSPLINE_TASK_PATCHES:
+            obj.set_control_points(points)
+            self._add_imported(obj)
+            self.redraw()
+            return
+        executor = self._parse_executor() if (os.cpu_count() or 1) > 1 else None
+
+        def work(task):
+            obj.set_control_points(points, executor)
+            task.report(1.0)
+            return obj
+
+        def done(obj):
+            self._add_imported(obj)
+            self.redraw()
+
+        self.start_task(f"Tesselando {name}", work, done)
+
     def import_obj(self):
         filepath = filedialog.askopenfilename(
             title="Abrir Arquivo .obj", 
             filetypes=(("Wavefront OBJ", "*.obj"), ("Todos os arquivos", "*.*"))
         )
         if not filepath: return
-        
-        try:
-            imported_file = OBJHandler.load_from_obj(filepath)
-            
+        executor = self._parse_executor()
+
+        def work(task):
+            return OBJHandler.load_from_obj(filepath, use_cache=True, executor=executor,
+                                            progress=lambda f: task.report(f, "lendo"))
+
+        def done(imported_file):
             for obj in imported_file.objects:
-                original_name = obj.name
-                count = 1
-                while self.display_file.get_object_by_name(obj.name):
-                    obj.name = f"{original_name}_{count}"
-                    count += 1
-                
-                self.display_file.add_object(obj)
-                self.objects_listbox.insert(tk.END, f"{obj.name} ({obj.type})")
-            
+                self._add_imported(obj)
             self.redraw()
-        except Exception as e:
-            messagebox.showerror("Erro de Importação", f"Não foi possível ler o arquivo:\n{e}")
+
+        self.start_task(f"Importando {os.path.basename(filepath)}", work, done)
 
     def import_surface_obj(self):
         filepath = filedialog.askopenfilename(
@@ -480,44 +558,35 @@ class GraphicsApp:
             filetypes=(("Wavefront OBJ", "*.obj"), ("Todos os arquivos", "*.*"))
         )
         if not filepath: return
+        executor = self._parse_executor()
 
-        try:
-            vertices = []
-            with open(filepath, 'r') as f:
-                for line in f:
-                    parts = line.strip().split()
-                    if not parts: continue
-                    if parts[0] == 'v':
-                        x, y, z = float(parts[1]), float(parts[2]), float(parts[3])
-                        vertices.append(Ponto3D(x, y, z))
-            
+        def work(task):
+            vertices = OBJHandler.load_vertices(filepath, use_cache=True, executor=executor,
+                                                progress=lambda f: task.report(0.8 * f, "lendo"))
             if len(vertices) < 16:
+                return vertices, None
+
+            task.report(0.8, "tesselando")
+            surface = BicubicSurface("Superficie_Importada")
+            num_patches = len(vertices) // 16
+            surface.add_patches(vertices[:num_patches * 16].reshape(num_patches, 16, 3))
+            task.report(1.0)
+            return vertices, surface
+
+        def done(result):
+            vertices, surface = result
+            if surface is None:
                 messagebox.showwarning("Aviso", "O arquivo precisa ter pelo menos 16 vértices para formar um patch.")
                 return
-            
+
             if len(vertices) % 16 != 0:
                 messagebox.showwarning("Aviso", f"O número de vértices ({len(vertices)}) não é múltiplo de 16. Alguns pontos podem ser ignorados.")
 
-            name = "Superficie_Importada"
-            count = 1
-            while self.display_file.get_object_by_name(name):
-                name = f"Superficie_Importada_{count}"
-                count += 1
-            
-            surface = BicubicSurface(name)
-            
-            num_patches = len(vertices) // 16
-            for i in range(num_patches):
-                patch_points = vertices[i*16 : (i+1)*16]
-                surface.add_patch(patch_points)
-            
-            self.display_file.add_object(surface)
-            self.objects_listbox.insert(tk.END, f"{surface.name} ({surface.type})")
+            self._add_imported(surface)
             self.redraw()
-            messagebox.showinfo("Sucesso", f"Superfície criada com {num_patches} patches.")
-            
-        except Exception as e:
-            messagebox.showerror("Erro", f"Falha ao importar superfície: {e}")
+            messagebox.showinfo("Sucesso", f"Superfície criada com {len(surface.control_points)} patches.")
+
+        self.start_task(f"Importando superfície {os.path.basename(filepath)}", work, done)
 
     def export_obj(self):
         filepath = filedialog.asksaveasfilename(title="Salvar Arquivo .obj", defaultextension=".obj", filetypes=(("Wavefront OBJ", "*.obj"), ("Todos os arquivos", "*.*")))
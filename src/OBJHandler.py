@@ -1,99 +1,329 @@
 from src.DisplayFile import DisplayFile
 from src.Point import Point
 from src.Line import Line
-from src.Objeto3D import Objeto3D
-from src.Ponto3D import Ponto3D
+from src.Objeto3D import Objeto3D, unique_edges, face_edges
 from typing import List
+import os
+from concurrent.futures import as_completed
+from array import array
+import numpy as np
+from src.SceneCache import cache_path, read_cache, write_cache
+
+WRITE_CHUNK = 1 << 16
+PARSE_CHUNK_BYTES = 1 << 24
+PROGRESS_BYTES = 1 << 20
 
 class OBJHandler:
     @staticmethod
     def save_to_obj(display_file: DisplayFile, filename: str):
-        with open(filename, 'w') as f:
-            f.write("# OBJ exportado\n\n")
-            vertex_offset = 1
-            for obj in display_file.objects:
-                if isinstance(obj, Objeto3D):
-                    unique_points = []
-                    point_map = {} 
-                    for p1, p2 in obj.segments:
-                        if p1 not in point_map:
-                            point_map[p1] = len(unique_points) + 1
-                            unique_points.append(p1)
-                        if p2 not in point_map:
-                            point_map[p2] = len(unique_points) + 1
-                            unique_points.append(p2)
-                    
-                    f.write(f"o {obj.name}\n")
-                    for p in unique_points:
-                        f.write(f"v {p.x} {p.y} {p.z}\n")
-                    
-                    for p1, p2 in obj.segments:
-                        idx1 = vertex_offset + point_map[p1] - 1
-                        idx2 = vertex_offset + point_map[p2] - 1
-                        f.write(f"l {idx1} {idx2}\n")
-                    
-                    vertex_offset += len(unique_points)
-                    f.write("\n")
-                
-                # Suporte legado para objetos 2D
-                elif hasattr(obj, 'world_coords'):
-                    f.write(f"o {obj.name}\n")
-                    for x, y in obj.world_coords:
-                        f.write(f"v {x} {y} 0.0\n")
-                    if obj.type == "Line":
-                        f.write(f"l {vertex_offset} {vertex_offset + 1}\n")
-                    elif obj.type == "Wireframe":
-                        for i in range(len(obj.world_coords)):
-                            s = vertex_offset + i
-                            e = vertex_offset + ((i + 1) % len(obj.world_coords))
-                            f.write(f"l {s} {e}\n")
-                    vertex_offset += len(obj.world_coords)
-                    f.write("\n")
+        with open(filename, 'wb') as f:
+            OBJHandler.write_obj(display_file, f)
+
+    @staticmethod
+    def write_obj(display_file: DisplayFile, stream):
+        # escreve em qualquer stream binario; vertices e arestas sao formatados em
+        # blocos de WRITE_CHUNK linhas com uma unica operacao de formatacao por bloco
+        stream.write(b"# OBJ exportado\n\n")
+        vertex_offset = 1
+        for obj in display_file.objects:
+            if isinstance(obj, Objeto3D):
+                vertices = obj.vertices[:, :3]
+                edges = obj.edges
+
+            # Suporte legado para objetos 2D
+            elif hasattr(obj, 'world_coords'):
+                coords = np.asarray(obj.world_coords, dtype=np.float64).reshape(-1, 2)
+                vertices = np.hstack([coords, np.zeros((len(coords), 1))])
+                n = len(coords)
+                if obj.type == "Line":
+                    edges = np.array([[0, 1]])
+                elif obj.type == "Wireframe":
+                    edges = np.stack([np.arange(n), (np.arange(n) + 1) % n], axis=1)
+                else:
+                    edges = np.empty((0, 2), dtype=np.int64)
+            else:
+                continue
+
+            stream.write(f"o {obj.name}\n".encode())
+            OBJHandler._write_records(stream, "v %r %r %r\n", vertices)
+            if getattr(obj, 'face_vertices', None) is not None and len(obj.face_vertices):
+                edges = OBJHandler._write_faces(stream, obj, vertex_offset)
+            OBJHandler._write_records(stream, "l %d %d\n", edges + vertex_offset)
+            vertex_offset += len(vertices)
+            stream.write(b"\n")
+
+    @staticmethod
+    def _write_faces(stream, obj, vertex_offset):
+        # escreve as faces em ordem, uma sequencia de faces com o mesmo numero de vertices
+        # por vez, e devolve as arestas que nao pertencem a nenhuma face (as unicas que
+        # ainda precisam de registros 'l')
+        sizes = np.diff(obj.face_offsets)
+        starts = obj.face_offsets[:-1]
+        runs = np.concatenate([[0], np.nonzero(np.diff(sizes))[0] + 1, [len(sizes)]])
+        for a, b in zip(runs[:-1].tolist(), runs[1:].tolist()):
+            size = int(sizes[a])
+            rows = starts[a:b, None] + np.arange(size)
+            OBJHandler._write_records(stream, "f" + " %d" * size + "\n", obj.face_vertices[rows] + vertex_offset)
+
+        n = max(len(obj.vertices), 1)
+        covered = unique_edges(face_edges(obj.face_vertices, obj.face_offsets))
+        edges = np.sort(obj.edges, axis=1)
+        loose = ~np.isin(edges[:, 0].astype(np.int64) * n + edges[:, 1], covered[:, 0].astype(np.int64) * n + covered[:, 1])
+        return obj.edges[loose]
+
+    @staticmethod
+    def _write_records(stream, line_format, rows):
+        for start in range(0, len(rows), WRITE_CHUNK):
+            chunk = rows[start:start + WRITE_CHUNK]
+            text = (line_format * len(chunk)) % tuple(chunk.ravel().tolist())
+            stream.write(text.encode())
+
+    @staticmethod
+    def load_from_obj(filename: str, use_cache: bool = False, executor=None, progress=None) -> DisplayFile:
+        # com use_cache, abre o cache binario ao lado do .obj (np.memmap, sem parsing)
+        # e o (re)escreve quando ausente ou desatualizado; com um executor
+        # (concurrent.futures), o texto e dividido em faixas lidas em paralelo.
+        # progress(fracao) e chamado durante a leitura; uma excecao lancada por ele
+        # interrompe a importacao
+        if use_cache:
+            path = cache_path(filename, "scene")
+            cached = read_cache(path, filename)
+            if cached is not None:
+                return OBJHandler._display_file_from_blocks(*cached)
+
+        display_file = OBJHandler._parse_obj(filename, executor, progress)
+
+        if use_cache:
+            blocks = {}
+            for i, obj in enumerate(display_file.objects):
+                blocks[f"{i}/vertices"] = obj.vertices
+                blocks[f"{i}/edges"] = obj.edges
+                blocks[f"{i}/face_vertices"] = obj.face_vertices
+                blocks[f"{i}/face_offsets"] = obj.face_offsets
+            meta = {"objects": [{"name": obj.name} for obj in display_file.objects]}
+            try:
+                write_cache(path, filename, blocks, meta)
+            except OSError:
+                pass
+        return display_file
 
     @staticmethod
-    def load_from_obj(filename: str) -> DisplayFile:
+    def _display_file_from_blocks(meta, blocks) -> DisplayFile:
         display_file = DisplayFile()
-        vertices = [] 
-        
-        with open(filename, 'r') as f:
-            current_name = None
-            current_lines = []
-            
-            for line in f:
-                parts = line.strip().split()
-                if not parts: continue
-                
-                if parts[0] == 'v':
-                    x = float(parts[1])
-                    y = float(parts[2])
-                    z = float(parts[3]) if len(parts) > 3 else 0.0
-                    vertices.append(Ponto3D(x, y, z))
-                
-                elif parts[0] == 'o':
-                    if current_name and current_lines:
-                        OBJHandler._create_object3d(display_file, current_name, vertices, current_lines)
-                    current_name = parts[1]
-                    current_lines = []
-
-                elif parts[0] == 'l':
-                    indices = [int(p.split('/')[0]) for p in parts[1:]]
-                    for i in range(len(indices) - 1):
-                        current_lines.append((indices[i], indices[i+1]))
-                    if len(indices) > 2:
-                         current_lines.append((indices[-1], indices[0]))
-
-            if current_name and current_lines:
-                OBJHandler._create_object3d(display_file, current_name, vertices, current_lines)
+        for i, entry in enumerate(meta["objects"]):
+            obj = Objeto3D(entry["name"])
+            obj.vertices = blocks[f"{i}/vertices"]
+            obj.edges = blocks[f"{i}/edges"]
+            obj.face_vertices = blocks[f"{i}/face_vertices"]
+            obj.face_offsets = blocks[f"{i}/face_offsets"]
+            display_file.add_object(obj)
+        return display_file
+
+    @staticmethod
+    def load_vertices(filename: str, use_cache: bool = False, executor=None, progress=None) -> np.ndarray:
+        # apenas os registros 'v' do arquivo, como um array (V,3)
+        if use_cache:
+            path = cache_path(filename, "vertices")
+            cached = read_cache(path, filename)
+            if cached is not None:
+                return cached[1]["vertices"]
+
+        ranges = OBJHandler._chunk_ranges(filename, executor)
+        results = OBJHandler._map_ranges(filename, ranges, executor, vertices_only=True, progress=progress)
+        result = OBJHandler._concat_vertices([vertices for vertices, _ in results])
+
+        if use_cache:
+            try:
+                write_cache(path, filename, {"vertices": result})
+            except OSError:
+                pass
+        return result
+
+    @staticmethod
+    def _chunk_ranges(filename: str, executor=None):
+        # faixas de bytes [inicio, fim) que comecam sempre no inicio de uma linha
+        size = os.path.getsize(filename)
+        if executor is None or size <= PARSE_CHUNK_BYTES:
+            return [(0, size)]
+        bounds = [0]
+        with open(filename, 'rb') as f:
+            for k in range(1, -(-size // PARSE_CHUNK_BYTES)):
+                f.seek(max(k * PARSE_CHUNK_BYTES, bounds[-1]))
+                f.readline()
+                if f.tell() >= size:
+                    break
+                bounds.append(f.tell())
+        bounds.append(size)
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    @staticmethod
+    def _map_ranges(filename, ranges, executor, vertices_only=False, progress=None):
+        if executor is None or len(ranges) == 1:
+            total = sum(b - a for a, b in ranges) or 1
+            done = 0
+            results = []
+            for a, b in ranges:
+                report = None
+                if progress is not None:
+                    report = lambda pos, a=a, done=done: progress((done + pos - a) / total)
+                results.append(parse_obj_range(filename, a, b, vertices_only, report))
+                done += b - a
+            return results
+
+        # em paralelo o progresso e contado por faixa concluida
+        futures = [executor.submit(parse_obj_range, filename, a, b, vertices_only) for a, b in ranges]
+        try:
+            if progress is not None:
+                for done, _ in enumerate(as_completed(futures), 1):
+                    progress(done / len(futures))
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    @staticmethod
+    def _concat_vertices(chunks):
+        if len(chunks) == 1:
+            return np.frombuffer(chunks[0], dtype=np.float64).reshape(-1, 3)
+        return np.concatenate([np.frombuffer(c, dtype=np.float64) for c in chunks]).reshape(-1, 3)
+
+    @staticmethod
+    def _parse_obj(filename: str, executor=None, progress=None) -> DisplayFile:
+        # cada faixa e lida por parse_obj_range; aqui os pedacos sao costurados:
+        # indices relativos recebem o deslocamento global de vertices da faixa e um
+        # objeto que atravessa faixas continua no pedaco sem nome da faixa seguinte
+        display_file = DisplayFile()
+        ranges = OBJHandler._chunk_ranges(filename, executor)
+        results = OBJHandler._map_ranges(filename, ranges, executor, progress=progress)
+        vertices = OBJHandler._concat_vertices([v for v, _ in results])
+
+        # elementos antes do primeiro 'o' pertencem a um objeto com o nome do arquivo
+        default_name = os.path.splitext(os.path.basename(filename))[0]
+        current = [default_name, [], [], []]
+
+        def flush():
+            name, lines, faces, sizes = current
+            if any(len(x) for x in lines) or any(len(x) for x in faces):
+                OBJHandler._create_object3d(display_file, name, vertices,
+                                            np.concatenate(lines) if lines else np.empty(0, dtype=np.int64),
+                                            np.concatenate(faces) if faces else np.empty(0, dtype=np.int64),
+                                            np.concatenate(sizes) if sizes else np.empty(0, dtype=np.int64))
+
+        base = 0
+        for chunk_vertices, pieces in results:
+            for name, lines, faces, sizes, relative_lines, relative_faces in pieces:
+                if name is not None:
+                    flush()
+                    current[:] = [name or default_name, [], [], []]
+                lines = np.frombuffer(lines, dtype=np.int64)
+                faces = np.frombuffer(faces, dtype=np.int64)
+                if base and (relative_lines or relative_faces):
+                    lines = lines.copy(); faces = faces.copy()
+                    lines[np.frombuffer(relative_lines, dtype=np.int64)] += base
+                    faces[np.frombuffer(relative_faces, dtype=np.int64)] += base
+                current[1].append(lines)
+                current[2].append(faces)
+                current[3].append(np.frombuffer(sizes, dtype=np.int64))
+            base += len(chunk_vertices) // 3
+        flush()
         
         return display_file
 
     @staticmethod
-    def _create_object3d(display_file, name, all_vertices, lines_indices):
+    def _create_object3d(display_file, name, all_vertices, lines_indices, face_indices, face_sizes):
         obj = Objeto3D(name)
-        for idx1, idx2 in lines_indices:
-            p1 = all_vertices[idx1 - 1]
-            p2 = all_vertices[idx2 - 1]
-            new_p1 = Ponto3D(p1.x, p1.y, p1.z)
-            new_p2 = Ponto3D(p2.x, p2.y, p2.z)
-            obj.add_segment(new_p1, new_p2)
+        # reindexa apenas os vertices usados pelo objeto (compartilhados entre arestas e faces);
+        # arestas de faces vizinhas e arestas repetidas sao guardadas uma unica vez
+        lines = np.asarray(lines_indices, dtype=np.int64).reshape(-1, 2)
+        faces = np.asarray(face_indices, dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(np.asarray(face_sizes, dtype=np.int64))])
+        edges = unique_edges(np.concatenate([lines, face_edges(faces, offsets)]))
+        used = np.unique(np.concatenate([edges.ravel(), faces]))
+
+        obj.set_geometry(all_vertices[used], np.searchsorted(used, edges))
+        if len(faces):
+            obj.face_vertices = np.searchsorted(used, faces).astype(np.int32)
+            obj.face_offsets = offsets.astype(np.int32)
         display_file.add_object(obj)
+
+
+def parse_obj_range(filename: str, start: int, end: int, vertices_only: bool = False, progress=None):
+    # le em fluxo as linhas em [start, end) de um .obj. Devolve (vertices, pedacos):
+    # vertices e um array('d') com 3 floats por vertice; cada pedaco e
+    # (nome, arestas, faces, tamanhos das faces, posicoes relativas em arestas, em faces),
+    # com nome None para o pedaco que continua o objeto da faixa anterior.
+    # Indices positivos ja saem globais (base 0); negativos saem relativos ao inicio da faixa.
+    # progress(posicao em bytes) e chamado a cada PROGRESS_BYTES lidos
+    vertices = array('d')
+    pieces = []
+    piece = [None, array('q'), array('q'), array('q'), array('q'), array('q')]
+
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        pos = start
+        # um unico teste por linha cobre o fim da faixa e o proximo aviso de progresso
+        mark = start + PROGRESS_BYTES if progress is not None else end
+        stop = min(mark, end)
+        for line in f:
+            if pos >= stop:
+                if pos >= end:
+                    break
+                progress(pos)
+                mark += PROGRESS_BYTES
+                stop = min(mark, end)
+            pos += len(line)
+            parts = line.split()
+            if not parts: continue
+
+            if parts[0] == b'v':
+                vertices.append(float(parts[1]))
+                vertices.append(float(parts[2]))
+                vertices.append(float(parts[3]) if len(parts) > 3 else 0.0)
+            elif vertices_only:
+                continue
+
+            elif parts[0] == b'o':
+                pieces.append(piece)
+                name = parts[1].decode('utf-8', 'replace') if len(parts) > 1 else ""
+                piece = [name, array('q'), array('q'), array('q'), array('q'), array('q')]
+
+            elif parts[0] == b'l':
+                _, lines, _, _, relative, _ = piece
+                indices, flags = _parse_indices(parts[1:], len(vertices) // 3)
+                m = len(indices)
+                if m == 2:
+                    order = (0, 1)
+                else:
+                    order = [j + d for j in range(m - 1) for d in (0, 1)]
+                    if m > 2:
+                        order += [m - 1, 0]
+                if flags is not None:
+                    relative.extend(len(lines) + p for p, k in enumerate(order) if flags[k])
+                lines.extend(indices if m == 2 else [indices[k] for k in order])
+
+            elif parts[0] == b'f':
+                _, _, faces, sizes, _, relative = piece
+                indices, flags = _parse_indices(parts[1:], len(vertices) // 3)
+                if flags is not None:
+                    relative.extend(len(faces) + p for p, flag in enumerate(flags) if flag)
+                faces.extend(indices)
+                sizes.append(len(indices))
+
+    pieces.append(piece)
+    return vertices, pieces
+
+def _parse_indices(tokens, num_vertices):
+    # "i", "i/vt", "i/vt/vn" -> base 0. Indices negativos sao relativos ao ultimo vertice
+    # lido; flags marca quais foram relativos (None quando nenhum foi)
+    indices = [int(token.partition(b'/')[0]) for token in tokens]
+    flags = None
+    for k, i in enumerate(indices):
+        if i > 0:
+            indices[k] = i - 1
+        else:
+            indices[k] = num_vertices + i
+            if flags is None:
+                flags = [False] * len(indices)
+            flags[k] = True
+    return indices, flags
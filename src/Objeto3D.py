@@ -1,34 +1,63 @@
-from src.Ponto3D import Ponto3D
+import numpy as np
+from src.Ponto3D import Ponto3D, points_to_array
 from src.Transformations import translation_matrix
 
+def grid_edges(rows: int, cols: int) -> np.ndarray:
+    # arestas de uma grade rows x cols de vertices indexada em ordem row-major:
+    # primeiro as curvas ao longo das colunas (t), depois ao longo das linhas (s)
+    idx = np.arange(rows * cols, dtype=np.int32).reshape(rows, cols)
+    along_t = np.stack([idx[:, :-1].ravel(), idx[:, 1:].ravel()], axis=1)
+    along_s = np.stack([idx[:-1, :].T.ravel(), idx[1:, :].T.ravel()], axis=1)
+    return np.concatenate([along_t, along_s])
+
+def is_affine(matrix) -> bool:
+    # Bezier e B-spline sao invariantes a transformacoes afins: a malha pode
+    # ser transformada diretamente, sem re-tesselar
+    return np.allclose(np.asarray(matrix)[3], (0.0, 0.0, 0.0, 1.0))
+
+def unique_edges(edges) -> np.ndarray:
+    # (M,2) -> arestas sem repeticao, independente da orientacao
+    edges = np.sort(np.asarray(edges).reshape(-1, 2), axis=1)
+    return np.unique(edges, axis=0)
+
+def face_edges(face_vertices, face_offsets) -> np.ndarray:
+    # faces em formato CSR (indices concatenados + offsets, F+1) -> arestas do contorno de cada face
+    face_vertices = np.asarray(face_vertices)
+    face_offsets = np.asarray(face_offsets)
+    starts, ends = face_offsets[:-1], face_offsets[1:]
+    nonempty = ends > starts
+    nxt = np.arange(1, len(face_vertices) + 1)
+    nxt[ends[nonempty] - 1] = starts[nonempty]
+    return np.stack([face_vertices, face_vertices[nxt]], axis=1)
+
 class Objeto3D:
     def __init__(self, name):
         self.name = name
         self.type = "Objeto3D"
-        self.segments = []
+        # structure-of-arrays: vertices (N,4) homogeneos e arestas (M,2) como indices
+        self.vertices = np.empty((0, 4))
+        self.edges = np.empty((0, 2), dtype=np.int32)
+        # faces opcionais em formato CSR: face i = face_vertices[face_offsets[i]:face_offsets[i+1]]
+        self.face_vertices = np.empty(0, dtype=np.int32)
+        self.face_offsets = np.zeros(1, dtype=np.int32)
+
+    def set_geometry(self, vertices, edges):
+        self.vertices = points_to_array(vertices)
+        self.edges = np.ascontiguousarray(np.asarray(edges, dtype=np.int32).reshape(-1, 2))
 
-    def add_segment(self, p1: Ponto3D, p2: Ponto3D):
-        self.segments.append((p1, p2))
+    @property
+    def segments(self):
+        # compatibilidade: pares de Ponto3D que sao vistas sobre self.vertices
+        return [(Ponto3D.view(self.vertices, a), Ponto3D.view(self.vertices, b))
+                for a, b in self.edges.tolist()]
 
     def apply_transformation(self, matrix):
-        points = set()
-        for p1, p2 in self.segments:
-            points.add(p1)
-            points.add(p2)
-        for p in points:
-            p.apply_transform(matrix)
+        self.vertices[:] = self.vertices @ np.asarray(matrix, dtype=np.float64).T
 
     def get_center(self):
-        points = set()
-        for p1, p2 in self.segments:
-            points.add(p1)
-            points.add(p2)
-        if not points: return (0,0,0)
-        sx = sum(p.x for p in points)
-        sy = sum(p.y for p in points)
-        sz = sum(p.z for p in points)
-        n = len(points)
-        return (sx/n, sy/n, sz/n)
+        if len(self.vertices) == 0: return (0,0,0)
+        cx, cy, cz = self.vertices[:, :3].mean(axis=0)
+        return (float(cx), float(cy), float(cz))
 
     def transform_to_center(self, matrix):
         cx, cy, cz = self.get_center()
@@ -1,13 +1,54 @@
 import numpy as np
 
 class Ponto3D:
+    __slots__ = ("coords",)
+
     def __init__(self, x, y, z=0.0):
-        self.x = float(x)
-        self.y = float(y)
-        self.z = float(z)
-        self.coords = np.array([self.x, self.y, self.z, 1.0])
+        self.coords = np.array([float(x), float(y), float(z), 1.0])
+
+    @classmethod
+    def view(cls, buffer, index):
+        # vista sobre uma linha de um buffer (N,4) compartilhado; nao copia
+        p = cls.__new__(cls)
+        p.coords = buffer[index]
+        return p
+
+    @property
+    def x(self):
+        return float(self.coords[0])
+
+    @x.setter
+    def x(self, value):
+        self.coords[0] = value
+
+    @property
+    def y(self):
+        return float(self.coords[1])
+
+    @y.setter
+    def y(self, value):
+        self.coords[1] = value
+
+    @property
+    def z(self):
+        return float(self.coords[2])
+
+    @z.setter
+    def z(self, value):
+        self.coords[2] = value
 
     def apply_transform(self, matrix):
-        self.coords = np.dot(matrix, self.coords)
-        self.x, self.y, self.z = self.coords[0], self.coords[1], self.coords[2]
+        self.coords[:] = np.dot(matrix, self.coords)
+
 
+def points_to_array(points) -> np.ndarray:
+    # aceita Ponto3D, tuplas (x,y,z) ou um array (N,3)/(N,4); devolve (N,4) float64
+    if isinstance(points, np.ndarray):
+        arr = np.asarray(points, dtype=np.float64).reshape(-1, points.shape[-1])
+    else:
+        arr = np.array([p.coords if isinstance(p, Ponto3D) else p for p in points], dtype=np.float64)
+        if arr.size == 0:
+            return np.empty((0, 4))
+    if arr.shape[1] == 3:
+        arr = np.hstack([arr, np.ones((len(arr), 1))])
+    return np.ascontiguousarray(arr)
@@ -0,0 +1,229 @@
+from contextlib import nullcontext
+import numpy as np
+import src.theme as theme
+from src.Viewport import transform_coordinates, transform_coordinates_batch, project_vertices
+from src.Transformations import view_transform_matrix, perspective_matrix
+from src.Clipping import (clip_point, clip_line_cs, clip_line_lb, clip_polygon_sh, clip_bezier,
+                          clip_lines_cs_batch, clip_lines_lb_batch, de_casteljau,
+                          classify_bounds, BOUNDS_OUTSIDE, BOUNDS_INSIDE)
+from src.Objeto3D import Objeto3D
+from src.BicubicSurface import BicubicSurface
+from src.BSplineSurface import BSplineSurface
+from src.Tessellation import DEFAULT_TOLERANCE, wang_steps, pixel_scale
+from src.SpatialIndex import window_bounds, segment_count
+
+BEZIER_SAMPLES = 100
+BSPLINE_STEPS = 20
+POINT_RADIUS = 2
+
+STYLES = {
+    "Point": {"fill": theme.POINT_COLOR, "outline": theme.POINT_COLOR},
+    "Line": {"fill": theme.LINE_COLOR, "width": 2},
+    "Wireframe": {"fill": theme.WIREFRAME_COLOR, "width": 2},
+    "Bezier Curve": {"fill": theme.BEZIER_COLOR, "width": 2},
+    "BSpline": {"fill": theme.BSPLINE_COLOR, "width": 2},
+    "Objeto3D": {"fill": theme.WIREFRAME_COLOR, "width": 2},
+}
+
+
+class Camera:
+    def __init__(self, vrp=(0, 0, 500), vpn=(0, 0, 1), vup=(0, 1, 0), perspective: bool = False, d=None):
+        self.vrp = vrp
+        self.vpn = vpn
+        self.vup = vup
+        # com perspective e sem d, so a divisao homogenea e aplicada (w = 1)
+        self.perspective = perspective
+        self.d = d
+
+    def matrix(self) -> np.ndarray:
+        view_mat = view_transform_matrix(self.vrp, self.vpn, self.vup)
+        if self.perspective and self.d is not None:
+            return perspective_matrix(self.d if self.d != 0 else 1.0) @ view_mat
+        return view_mat
+
+
+class Primitive:
+    # saida do renderer em coordenadas de tela: kind "lines" (cada item e uma
+    # poligonal [x1, y1, x2, y2, ...]) ou "ovals" (cada item e uma caixa [x1, y1, x2, y2])
+    __slots__ = ("key", "kind", "items", "style")
+
+    def __init__(self, key, kind: str, items, style: dict):
+        self.key = key
+        self.kind = kind
+        self.items = items
+        self.style = style
+
+
+class Renderer:
+    # projecao, culling e recorte da cena inteira, sem depender do Tk; os backends
+    # (canvas, framebuffer) so desenham as primitivas. Com um FrameStats, cada etapa
+    # e cronometrada e, se stats.detailed, os segmentos sao contados
+    def __init__(self, clip_algorithm: str = "CS", adaptive: bool = False, tolerance: float = DEFAULT_TOLERANCE,
+                 stats=None):
+        self.clip_algorithm = clip_algorithm
+        self.adaptive = adaptive
+        self.tolerance = tolerance
+        self.stats = stats
+        self.count_segments = stats is not None and stats.detailed
+
+    def _stage(self, name: str):
+        return self.stats.stage(name) if self.stats is not None else nullcontext()
+
+    def _count(self, name: str, n: int = 1):
+        if self.stats is not None:
+            self.stats.count(name, n)
+
+    def _count_segments(self, considered: int, clipped: int):
+        # em segmentos do objeto (ver segment_count): considerados pelo recorte, rejeitados
+        # por ele e os que sobraram, mesmo que o recorte os divida em varios pedacos
+        if not self.count_segments:
+            return
+        self._count("segments.considered", considered)
+        self._count("segments.clipped", clipped)
+        self._count("segments.drawn", considered - clipped)
+
+    def _clip_lines(self, segments, window):
+        if self.clip_algorithm == "CS":
+            return clip_lines_cs_batch(segments, window)
+        return clip_lines_lb_batch(segments, window)
+
+    def render(self, display_file, window, viewport, camera: Camera):
+        with self._stage("view_matrix"):
+            full_mat = camera.matrix()
+        # so os objetos cujas caixas podem tocar a window sao recortados e desenhados
+        with self._stage("cull"):
+            visible = display_file.query(window_bounds(window), full_mat, camera.perspective)
+        self._count("objects", len(display_file))
+        self._count("objects.culled", len(display_file) - len(visible))
+        if self.count_segments:
+            self._count("segments.culled", display_file.segment_total - sum(map(display_file.segments_of, visible)))
+
+        primitives = []
+        for obj in visible:
+            if isinstance(obj, Objeto3D):
+                primitive = self._render_3d(obj, full_mat, window, viewport, camera.perspective)
+            else:
+                primitive = self._render_2d(obj, window, viewport)
+            if primitive is not None and primitive.items:
+                primitives.append(primitive)
+        return primitives
+
+    def _render_3d(self, obj, full_mat, window, viewport, perspective):
+        if self.adaptive and isinstance(obj, (BicubicSurface, BSplineSurface)):
+            with self._stage("tessellation"):
+                vertices, edges = obj.tessellate_adaptive(full_mat, window, viewport, perspective, self.tolerance)
+            # a malha adaptativa nao e a guardada: suas arestas sao contadas a parte, e
+            # considered/drawn seguem nas arestas da malha guardada, como o culling
+            if self.count_segments:
+                self._count("segments.tessellated", len(edges))
+        else:
+            vertices, edges = obj.vertices, obj.edges
+        with self._stage("projection"):
+            screen = project_vertices(vertices, full_mat, window, viewport, perspective)
+            items = screen[edges].reshape(-1, 4).tolist()
+        self._count_segments(segment_count(obj), 0)
+        return Primitive(id(obj), "lines", items, STYLES["Objeto3D"])
+
+    def _render_2d(self, obj, window, viewport):
+        # caixa do objeto inteira dentro da window: nada a recortar; inteira fora: nada a desenhar
+        with self._stage("clip." + obj.type):
+            bounds_status = classify_bounds(obj.get_bounds(), window)
+        if bounds_status == BOUNDS_OUTSIDE:
+            self._count("objects.culled")
+            if self.count_segments:
+                self._count("segments.culled", segment_count(obj))
+            return None
+        inside = bounds_status == BOUNDS_INSIDE
+        style = STYLES.get(obj.type)
+        coords = obj.world_coords
+
+        if obj.type == "Point":
+            with self._stage("clip.Point"):
+                visible = inside or clip_point(coords[0], window)
+            if not visible:
+                return None
+            with self._stage("projection"):
+                x, y = transform_coordinates(coords[0], window, viewport)
+            r = POINT_RADIUS
+            return Primitive(id(obj), "ovals", [(x - r, y - r, x + r, y + r)], style)
+
+        if obj.type == "Line":
+            with self._stage("clip.Line"):
+                if inside:
+                    clipped = coords
+                elif self.clip_algorithm == "CS":
+                    clipped = clip_line_cs(coords[0], coords[1], window)
+                else:
+                    clipped = clip_line_lb(coords[0], coords[1], window)
+            self._count_segments(1, int(not clipped))
+            if not clipped:
+                return None
+            with self._stage("projection"):
+                screen = [transform_coordinates(p, window, viewport) for p in clipped]
+            return Primitive(id(obj), "lines", [screen] if len(screen) >= 2 else [], style)
+
+        if obj.type == "Wireframe":
+            rejected = 0
+            with self._stage("clip.Wireframe"):
+                clipped = coords if inside else clip_polygon_sh(coords, window)
+                if self.count_segments and not inside and len(coords) >= 2:
+                    # o Sutherland-Hodgman devolve um novo poligono; as arestas originais
+                    # rejeitadas sao contadas pelo recorte de linhas em lote
+                    points = np.asarray(coords, dtype=np.float64)
+                    _, mask = self._clip_lines(np.stack([points, np.roll(points, -1, axis=0)], axis=1), window)
+                    rejected = int((~mask).sum())
+            self._count_segments(segment_count(obj), rejected)
+            if not clipped or len(clipped) < 2:
+                return None
+            with self._stage("projection"):
+                screen = [transform_coordinates(p, window, viewport) for p in clipped]
+            edges = [screen[i] + screen[(i + 1) % len(screen)] for i in range(len(screen))]
+            return Primitive(id(obj), "lines", edges, style)
+
+        if obj.type == "Bezier Curve":
+            segments = obj.get_segments()
+            with self._stage("clip.Bezier Curve"):
+                clipped_segments = []
+                rejected = 0
+                for segment in segments:
+                    if inside:
+                        clipped_segments.append(segment)
+                        continue
+                    pieces = clip_bezier(segment, window)
+                    rejected += not pieces
+                    clipped_segments.extend(pieces)
+            self._count_segments(len(segments), rejected)
+            screen = []
+            for segment in clipped_segments:
+                with self._stage("tessellation"):
+                    num_samples = BEZIER_SAMPLES
+                    if self.adaptive:
+                        num_samples = int(wang_steps(np.asarray(segment) * pixel_scale(window, viewport), self.tolerance)) + 1
+                    points = [de_casteljau(segment, t) for t in np.linspace(0, 1, num_samples)]
+                with self._stage("projection"):
+                    screen.extend(transform_coordinates(p, window, viewport) for p in points)
+            return Primitive(id(obj), "lines", [screen] if len(screen) >= 2 else [], style)
+
+        if obj.type == "BSpline":
+            with self._stage("tessellation"):
+                num_steps = obj.span_steps(pixel_scale(window, viewport), self.tolerance) if self.adaptive else BSPLINE_STEPS
+                curve_points = np.asarray(obj.generate_points(num_steps=num_steps))
+            if len(curve_points) < 2:
+                return None
+            segments = np.stack([curve_points[:-1], curve_points[1:]], axis=1)
+            spans = len(obj.world_coords) - 3
+            rejected = 0
+            if not inside:
+                with self._stage("clip.BSpline"):
+                    segments_clipped, mask = self._clip_lines(segments, window)
+                    segments = segments_clipped[mask]
+                # cada trecho gera steps+1 pontos; ele e rejeitado quando nenhum dos seus
+                # pedacos sobrevive ao recorte
+                starts = np.concatenate([[0], np.cumsum(np.broadcast_to(num_steps, (spans,)) + 1)[:-1]])
+                rejected = int((np.add.reduceat(mask, starts) == 0).sum())
+            self._count_segments(spans, rejected)
+            with self._stage("projection"):
+                screen = transform_coordinates_batch(segments.reshape(-1, 2), window, viewport)
+            return Primitive(id(obj), "lines", screen.reshape(-1, 4).tolist(), style)
+
+        return None
@@ -0,0 +1,71 @@
+import tkinter as tk
+
+
+class RetainedCanvas:
+    # mantem os itens do canvas de cada objeto entre quadros: itens existentes sao
+    # movidos com canvas.coords, os que sobram ficam ocultos e so objetos novos
+    # (ou que passaram a ter mais segmentos) criam itens
+    def __init__(self, canvas: tk.Canvas):
+        self.canvas = canvas
+        # chave do objeto -> tipo de item -> [itens, quantos estao visiveis]
+        self._pools = {}
+        self._visible = set()
+        self._drawn = set()
+
+    def draw(self, primitives):
+        # backend Tk do Renderer: um quadro inteiro a partir das primitivas de tela
+        self.begin_frame()
+        for primitive in primitives:
+            if primitive.kind == "ovals":
+                self.ovals(primitive.key, primitive.items, **primitive.style)
+            else:
+                self.lines(primitive.key, primitive.items, **primitive.style)
+        self.end_frame()
+
+    def begin_frame(self):
+        self._drawn = set()
+
+    def lines(self, key, items, **style):
+        # items: sequencia de listas de coordenadas [x1, y1, x2, y2, ...], uma por item
+        self._update(key, "line", items, style)
+
+    def ovals(self, key, items, **style):
+        # items: sequencia de caixas [x1, y1, x2, y2]
+        self._update(key, "oval", items, style)
+
+    def _update(self, key, kind, items, style):
+        canvas = self.canvas
+        pool = self._pools.setdefault(key, {}).setdefault(kind, [[], 0])
+        created, shown = pool
+        tag = f"obj{key}"
+        create = canvas.create_line if kind == "line" else canvas.create_oval
+
+        count = 0
+        for coords in items:
+            if count < len(created):
+                canvas.coords(created[count], *coords)
+                if count >= shown:
+                    canvas.itemconfigure(created[count], state=tk.NORMAL)
+            else:
+                created.append(create(*coords, tags=(tag,), **style))
+            count += 1
+        for item in created[count:shown]:
+            canvas.itemconfigure(item, state=tk.HIDDEN)
+
+        pool[1] = count
+        self._drawn.add(key)
+
+    def end_frame(self):
+        # objetos que nao foram desenhados neste quadro (recortados ou fora da vista) ficam ocultos
+        for key in self._visible - self._drawn:
+            self.canvas.itemconfigure(f"obj{key}", state=tk.HIDDEN)
+            for pool in self._pools[key].values():
+                pool[1] = 0
+        self._visible = self._drawn
+
+    def clear(self):
+        for key in self._pools:
+            self.canvas.delete(f"obj{key}")
+        self._pools.clear()
+        self._visible = set()
+        self._drawn = set()
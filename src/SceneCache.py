@@ -0,0 +1,82 @@
+import os
+import json
+import struct
+import hashlib
+import numpy as np
+
+# formato: MAGIC | versao (u32) | tamanho do cabecalho (u32) | cabecalho JSON | blocos
+# cada bloco e um array cru (C-contiguo) alinhado em ALIGN bytes, aberto com np.memmap
+MAGIC = b"2DCSCACH"
+VERSION = 3
+ALIGN = 64
+_PREFIX = struct.Struct("<8sII")
+
+def cache_path(source: str, kind: str) -> str:
+    return f"{source}.{kind}.cache"
+
+def file_digest(path: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _source_info(source: str) -> dict:
+    st = os.stat(source)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+def write_cache(path: str, source: str, blocks: dict, meta: dict = None):
+    # blocks: nome -> ndarray; meta: qualquer dado serializavel em JSON
+    info = _source_info(source)
+    info["blake2b"] = file_digest(source)
+
+    arrays = {name: np.ascontiguousarray(arr) for name, arr in blocks.items()}
+    table = {}
+    offset = 0
+    for name, arr in arrays.items():
+        table[name] = {"offset": offset, "shape": list(arr.shape), "dtype": arr.dtype.str}
+        offset = _align(offset + arr.nbytes)
+
+    header = json.dumps({"source": info, "meta": meta or {}, "blocks": table}).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(header))
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for name, arr in arrays.items():
+            f.seek(data_start + table[name]["offset"])
+            f.write(arr.data)
+        f.truncate(data_start + offset)
+    os.replace(tmp, path)
+
+def read_cache(path: str, source: str):
+    # devolve (meta, blocos como memmap copy-on-write) ou None se ausente, invalido ou desatualizado
+    try:
+        with open(path, "rb") as f:
+            magic, version, header_len = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != MAGIC or version != VERSION:
+                return None
+            header = json.loads(f.read(header_len).decode("utf-8"))
+
+        cached, current = header["source"], _source_info(source)
+        if cached["size"] != current["size"]:
+            return None
+        if cached["mtime_ns"] != current["mtime_ns"] and cached["blake2b"] != file_digest(source):
+            return None
+
+        data_start = _align(_PREFIX.size + header_len)
+        blocks = {}
+        for name, entry in header["blocks"].items():
+            shape = tuple(entry["shape"])
+            if 0 in shape:
+                blocks[name] = np.empty(shape, dtype=entry["dtype"])
+            else:
+                blocks[name] = np.memmap(path, dtype=entry["dtype"], mode="c",
+                                         offset=data_start + entry["offset"], shape=shape)
+        return header["meta"], blocks
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
@@ -0,0 +1,128 @@
+import math
+import numpy as np
+from src.Objeto3D import Objeto3D
+
+GRID_CELL = 100.0
+MAX_CELLS = 256
+
+_PPC_CORNERS = np.array([[0.0, 0.0, 1.0], [1.0, 0.0, 1.0], [0.0, 1.0, 1.0], [1.0, 1.0, 1.0]])
+_BOX_CORNERS = np.array([[i & 1, (i >> 1) & 1, (i >> 2) & 1] for i in range(8)], dtype=bool)
+
+def object_bounds(obj):
+    # 2D: (xmin, ymin, xmax, ymax); 3D: (xmin, ymin, zmin, xmax, ymax, zmax); None se vazio.
+    # Para curvas os pontos de controle bastam: a curva fica no fecho convexo deles
+    if not isinstance(obj, Objeto3D):
+        return obj.get_bounds()
+    if len(obj.vertices) == 0:
+        return None
+    points = obj.vertices[:, :3]
+    return tuple(points.min(axis=0).tolist() + points.max(axis=0).tolist())
+
+def segment_count(obj) -> int:
+    # quantos segmentos o recorte recebe do objeto: arestas (3D, poligonos, linhas) ou
+    # trechos de curva (segmentos cubicos da Bezier, trechos de 4 pontos da B-spline)
+    if isinstance(obj, Objeto3D):
+        return len(obj.edges)
+    n = len(obj.world_coords)
+    if obj.type == "Line" or obj.type == "Wireframe":
+        return (1 if obj.type == "Line" else n) if n >= 2 else 0
+    if obj.type == "Bezier Curve":
+        return (n - 1) // 3 if n >= 4 else 0
+    if obj.type == "BSpline":
+        return max(n - 3, 0)
+    return 0
+
+def window_bounds(window):
+    # caixa alinhada aos eixos que contem a window (rotacionada ou nao)
+    corners = _PPC_CORNERS @ window.ppc_to_wc_matrix()[:2].T
+    (x_min, y_min), (x_max, y_max) = corners.min(axis=0), corners.max(axis=0)
+    return float(x_min), float(y_min), float(x_max), float(y_max)
+
+def overlaps(a, b) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+def visible_boxes(boxes, matrix, bounds, perspective: bool = False) -> np.ndarray:
+    # caixas 3D (N,6) -> mascara das que podem aparecer em `bounds` depois da projecao.
+    # Com perspectiva, caixas com algum canto atras do centro de projecao sao mantidas
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 6)
+    corners = np.where(_BOX_CORNERS, boxes[:, None, 3:], boxes[:, None, :3])
+    homogeneous = np.concatenate([corners, np.ones(corners.shape[:2] + (1,))], axis=2)
+    projected = homogeneous @ np.asarray(matrix, dtype=np.float64).T
+    keep = np.zeros(len(boxes), dtype=bool)
+    if perspective:
+        w = projected[..., 3]
+        keep = (w <= 0).any(axis=1)
+        projected = projected / np.where(w > 0, w, 1.0)[..., None]
+    xy = projected[..., :2]
+    lo, hi = xy.min(axis=1), xy.max(axis=1)
+    inside = ((lo[:, 0] <= bounds[2]) & (hi[:, 0] >= bounds[0]) &
+              (lo[:, 1] <= bounds[3]) & (hi[:, 1] >= bounds[1]))
+    return keep | inside
+
+
+class GridIndex:
+    # grade uniforme (hash de celulas) sobre caixas 2D; caixas que cobririam mais de
+    # MAX_CELLS celulas ficam em uma lista a parte, sempre testada
+    def __init__(self, cell_size: float = GRID_CELL):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._bounds = {}
+        self._large = set()
+
+    def __len__(self):
+        return len(self._bounds)
+
+    def _cell_range(self, bounds):
+        s = self.cell_size
+        return (math.floor(bounds[0] / s), math.floor(bounds[1] / s),
+                math.floor(bounds[2] / s), math.floor(bounds[3] / s))
+
+    def insert(self, key, bounds):
+        self._bounds[key] = bounds
+        if bounds is None:
+            self._large.add(key)
+            return
+        i0, j0, i1, j1 = self._cell_range(bounds)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > MAX_CELLS:
+            self._large.add(key)
+            return
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                self._cells.setdefault((i, j), set()).add(key)
+
+    def remove(self, key):
+        bounds = self._bounds.pop(key, None)
+        if key in self._large:
+            self._large.discard(key)
+            return
+        if bounds is None:
+            return
+        i0, j0, i1, j1 = self._cell_range(bounds)
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = self._cells[(i, j)]
+                cell.discard(key)
+                if not cell:
+                    del self._cells[(i, j)]
+
+    def update(self, key, bounds):
+        self.remove(key)
+        self.insert(key, bounds)
+
+    def query(self, bounds) -> set:
+        # chaves cujas caixas tocam `bounds` (caixas vazias sempre entram)
+        i0, j0, i1, j1 = self._cell_range(bounds)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self._cells):
+            candidates = self._bounds.keys()
+        else:
+            candidates = set(self._large)
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    candidates.update(self._cells.get((i, j), ()))
+        return {key for key in candidates
+                if self._bounds[key] is None or overlaps(self._bounds[key], bounds)}
+
+    def clear(self):
+        self._cells.clear()
+        self._bounds.clear()
+        self._large.clear()
@@ -0,0 +1,85 @@
+import numpy as np
+from src.Objeto3D import grid_edges
+from src.Viewport import project_points
+
+DEFAULT_TOLERANCE = 0.5
+MIN_STEPS = 1
+MAX_STEPS = 64
+
+M_BEZIER = np.array([
+    [-1,  3, -3,  1],
+    [ 3, -6,  3,  0],
+    [-3,  3,  0,  0],
+    [ 1,  0,  0,  0]
+], dtype=np.float64)
+M_BEZIER_INV = np.linalg.inv(M_BEZIER)
+
+def pixel_scale(window, viewport) -> float:
+    # pixels por unidade de mundo (o maior dos dois eixos, para ficar conservador)
+    return max(viewport.width() / window.width(), viewport.height() / window.height())
+
+def power_basis(n: int) -> np.ndarray:
+    # linhas [u^3, u^2, u, 1] para n+1 amostras uniformes em [0,1]
+    u = np.arange(n + 1) / n
+    return np.stack([u**3, u**2, u, np.ones(n + 1)], axis=1)
+
+def wang_steps(control_points, tolerance=DEFAULT_TOLERANCE, min_steps=MIN_STEPS, max_steps=MAX_STEPS):
+    # formula de Wang: numero de segmentos para que a poligonal fique a menos de
+    # `tolerance` da curva de Bezier. control_points (..., d+1, dim) ja em pixels
+    P = np.asarray(control_points, dtype=np.float64)
+    degree = P.shape[-2] - 1
+    if degree < 2:
+        return np.full(P.shape[:-2], min_steps, dtype=np.int64)
+    second = P[..., :-2, :] - 2 * P[..., 1:-1, :] + P[..., 2:, :]
+    L = np.linalg.norm(second, axis=-1).max(axis=-1)
+    n = np.ceil(np.sqrt(degree * (degree - 1) * L / (8.0 * tolerance)))
+    return np.clip(n, min_steps, max_steps).astype(np.int64)
+
+def surface_steps(net, tolerance=DEFAULT_TOLERANCE, min_steps=MIN_STEPS, max_steps=MAX_STEPS):
+    # rede de Bezier (..., 4, 4, dim) em pixels -> (passos em s, passos em t)
+    net = np.asarray(net, dtype=np.float64)
+    along_s = wang_steps(np.swapaxes(net, -2, -3), tolerance, min_steps, max_steps).max(axis=-1)
+    along_t = wang_steps(net, tolerance, min_steps, max_steps).max(axis=-1)
+    return along_s, along_t
+
+def power_to_bezier(coeffs) -> np.ndarray:
+    # coeficientes na base [u^3, u^2, u, 1] (..., 4, dim) -> pontos de controle de Bezier
+    return M_BEZIER_INV @ coeffs
+
+def patch_steps(C, matrix, window, viewport, perspective=False, tolerance=DEFAULT_TOLERANCE,
+                min_steps=MIN_STEPS, max_steps=MAX_STEPS):
+    # projeta a rede de Bezier de cada patch (C em base de potencias, (P, xyz, 4, 4))
+    # para a tela e escolhe a resolucao pelo erro em pixels
+    net = (M_BEZIER_INV @ C @ M_BEZIER_INV.T).transpose(0, 2, 3, 1).reshape(-1, 3)
+    homogeneous = np.hstack([net, np.ones((len(net), 1))])
+    screen = project_points(homogeneous, matrix, window, viewport, perspective).reshape(-1, 4, 4, 2)
+    return surface_steps(screen, tolerance, min_steps, max_steps)
+
+def evaluate_patches(C, steps_s, steps_t):
+    # C (P, xyz, 4, 4) em base de potencias; avalia cada patch na sua propria grade,
+    # agrupando patches com a mesma resolucao. Devolve (vertices (K,3), arestas (E,2))
+    vertices = []
+    edges = []
+    offset = 0
+    for ns, nt in sorted(set(zip(steps_s.tolist(), steps_t.tolist()))):
+        sel = np.nonzero((steps_s == ns) & (steps_t == nt))[0]
+        grid = power_basis(ns) @ C[sel] @ power_basis(nt).T
+        block = (ns + 1) * (nt + 1)
+        vertices.append(grid.transpose(0, 2, 3, 1).reshape(-1, 3))
+        local = grid_edges(ns + 1, nt + 1)
+        offsets = offset + np.arange(len(sel), dtype=np.int32)[:, None, None] * block
+        edges.append((local[None, :, :] + offsets).reshape(-1, 2))
+        offset += len(sel) * block
+
+    if not vertices:
+        return np.empty((0, 3)), np.empty((0, 2), dtype=np.int32)
+    return np.concatenate(vertices), np.concatenate(edges).astype(np.int32)
+
+def adaptive_mesh(C, matrix, window, viewport, perspective=False, tolerance=DEFAULT_TOLERANCE,
+                  min_steps=MIN_STEPS, max_steps=MAX_STEPS):
+    # malha dependente da vista: (vertices (K,4) homogeneos, arestas (E,2))
+    if len(C) == 0:
+        return np.empty((0, 4)), np.empty((0, 2), dtype=np.int32)
+    steps_s, steps_t = patch_steps(C, matrix, window, viewport, perspective, tolerance, min_steps, max_steps)
+    vertices, edges = evaluate_patches(C, steps_s, steps_t)
+    return np.hstack([vertices, np.ones((len(vertices), 1))]), edges
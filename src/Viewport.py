@@ -1,6 +1,6 @@
 from src.Window import Window
 from typing import Tuple
-import math
+import numpy as np
 
 class Viewport:
     def __init__(self, x_min: int, y_min: int, x_max: int, y_max: int):
@@ -13,26 +13,51 @@ class Viewport:
     def height(self):
         return self.y_max - self.y_min
 
+    def ppc_to_screen_matrix(self) -> np.ndarray:
+        # inverte v
+        return np.array([
+            [self.width(), 0.0, self.x_min],
+            [0.0, -self.height(), self.y_max],
+            [0.0, 0.0, 1.0]
+        ])
+
 
 def transform_coordinates(point, window, viewport) -> tuple[int, int]:
-    u, v = wc_to_ppc(point, window)
-    return ppc_to_screen(u, v, viewport)
+    xw, yw = point
+    (a, b, c), (d, e, f), _ = window.wc_to_screen_matrix(viewport).tolist()
+    return int(round(a * xw + b * yw + c)), int(round(d * xw + e * yw + f))
 
 def wc_to_ppc(point, window) -> tuple[float, float]:
-    #tira centro; rotaciona por -theta; normaliza para [-w/2,+w/2]->[0,1].
     xw, yw = point
-    cx, cy = window.center()
-    theta = math.radians(window.angle)
-    cos_t, sin_t = math.cos(-theta), math.sin(-theta)
-
-    xr =  cos_t * (xw - cx) - sin_t * (yw - cy)
-    yr =  sin_t * (xw - cx) + cos_t * (yw - cy)
-
-    u = (xr / window.width())  + 0.5
-    v = (yr / window.height()) + 0.5
-    return u, v
+    (a, b, c), (d, e, f), _ = window.wc_to_ppc_matrix().tolist()
+    return a * xw + b * yw + c, d * xw + e * yw + f
 
 def ppc_to_screen(u, v, viewport: Viewport) -> tuple[int, int]:
     x = viewport.x_min + u * viewport.width()
     y = viewport.y_max - v * viewport.height()  # inverte v
-    return int(round(x)), int(round(y))
\ No newline at end of file
+    return int(round(x)), int(round(y))
+
+def apply_affine_2d(points, matrix) -> np.ndarray:
+    # aplica uma matriz homogenea 3x3 a um array (N,2)
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return pts @ matrix[:2, :2].T + matrix[:2, 2]
+
+def wc_to_ppc_batch(points, window) -> np.ndarray:
+    return apply_affine_2d(points, window.wc_to_ppc_matrix())
+
+def transform_coordinates_batch(points, window, viewport) -> np.ndarray:
+    screen = apply_affine_2d(points, window.wc_to_screen_matrix(viewport))
+    return np.rint(screen).astype(np.int64)
+
+def project_points(vertices, matrix, window, viewport, perspective: bool = False) -> np.ndarray:
+    # view (+ perspectiva) -> divisao homogenea -> PPC -> tela, sem arredondar
+    projected = np.asarray(vertices, dtype=np.float64) @ np.asarray(matrix, dtype=np.float64).T
+    if perspective:
+        w = projected[:, 3]
+        w = np.where(w != 0, w, 1.0)
+        projected = projected / w[:, None]
+    return apply_affine_2d(projected[:, :2], window.wc_to_screen_matrix(viewport))
+
+def project_vertices(vertices, matrix, window, viewport, perspective: bool = False) -> np.ndarray:
+    # todos os vertices de uma vez, em coordenadas inteiras de tela
+    return np.rint(project_points(vertices, matrix, window, viewport, perspective)).astype(np.int64)
@@ -1,11 +1,13 @@
 import math
+import numpy as np
 
 class Window:
     def __init__(self, x_min: float, y_min: float, x_max: float, y_max: float):
         self.x_min, self.y_min = x_min, y_min
         self.x_max, self.y_max = x_max, y_max
         self.angle = 0.0
-    
+        self._invalidate()
+
     def __iter__(self):
         yield self.x_min
         yield self.y_min
@@ -24,11 +26,52 @@ class Window:
             self.y_min + self.height() / 2.0
         )
 
+    def _invalidate(self):
+        self._wc_to_ppc = None
+        self._ppc_to_wc = None
+        self._wc_to_screen = None
+        self._screen_key = None
+
+    def wc_to_ppc_matrix(self) -> np.ndarray:
+        # 3x3 homogenea: tira centro; rotaciona por -theta; normaliza para [0,1]
+        if self._wc_to_ppc is None:
+            cx, cy = self.center()
+            theta = math.radians(self.angle)
+            cos_t, sin_t = math.cos(theta), math.sin(theta)
+            w, h = self.width(), self.height()
+            self._wc_to_ppc = np.array([
+                [ cos_t / w, sin_t / w, -(cos_t * cx + sin_t * cy) / w + 0.5],
+                [-sin_t / h, cos_t / h, ( sin_t * cx - cos_t * cy) / h + 0.5],
+                [0.0, 0.0, 1.0]
+            ])
+        return self._wc_to_ppc
+
+    def ppc_to_wc_matrix(self) -> np.ndarray:
+        if self._ppc_to_wc is None:
+            cx, cy = self.center()
+            theta = math.radians(self.angle)
+            cos_t, sin_t = math.cos(theta), math.sin(theta)
+            w, h = self.width(), self.height()
+            self._ppc_to_wc = np.array([
+                [cos_t * w, -sin_t * h, cx - 0.5 * (cos_t * w - sin_t * h)],
+                [sin_t * w,  cos_t * h, cy - 0.5 * (sin_t * w + cos_t * h)],
+                [0.0, 0.0, 1.0]
+            ])
+        return self._ppc_to_wc
+
+    def wc_to_screen_matrix(self, viewport) -> np.ndarray:
+        key = (viewport.x_min, viewport.y_min, viewport.x_max, viewport.y_max)
+        if self._wc_to_screen is None or self._screen_key != key:
+            self._wc_to_screen = viewport.ppc_to_screen_matrix() @ self.wc_to_ppc_matrix()
+            self._screen_key = key
+        return self._wc_to_screen
+
     def move(self, dx: float, dy: float):
         self.x_min += dx
         self.x_max += dx
         self.y_min += dy
         self.y_max += dy
+        self._invalidate()
 
     def move_local(self, dx_local: float, dy_local: float):
         theta = math.radians(self.angle)
@@ -47,9 +90,12 @@ class Window:
         self.x_max = center_x + new_width / 2.0
         self.y_min = center_y - new_height / 2.0
         self.y_max = center_y + new_height / 2.0
+        self._invalidate()
 
     def rotate(self, delta: float):
         self.angle = (self.angle + delta) % 360.0
+        self._invalidate()
 
     def set_angle(self, angle: float):
-        self.angle = angle % 360.0
\ No newline at end of file
+        self.angle = angle % 360.0
+        self._invalidate()
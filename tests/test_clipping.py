@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from src.Window import Window
+from src.Clipping import clip_line_cs, clip_line_lb, clip_lines_cs_batch, clip_lines_lb_batch
+
+def random_segments(seed, n=500):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-300, 300, size=(n, 2, 2))
+
+def windows():
+    straight = Window(-100.0, -80.0, 120.0, 90.0)
+    rotated = Window(-100.0, -80.0, 120.0, 90.0)
+    rotated.set_angle(30.0)
+    return [straight, rotated]
+
+# segmentos paralelos aos eixos, tocando as bordas e degenerados em um ponto
+EDGE_CASES = np.array([
+    [[-200.0, 0.0], [200.0, 0.0]],
+    [[0.0, -200.0], [0.0, 200.0]],
+    [[-100.0, -80.0], [120.0, -80.0]],
+    [[-150.0, 90.0], [-120.0, 90.0]],
+    [[10.0, 10.0], [10.0, 10.0]],
+    [[500.0, 500.0], [500.0, 500.0]],
+])
+
+@pytest.mark.parametrize("window", windows())
+@pytest.mark.parametrize("scalar, batch", [(clip_line_cs, clip_lines_cs_batch), (clip_line_lb, clip_lines_lb_batch)])
+def test_batch_matches_scalar(window, scalar, batch):
+    segments = np.concatenate([random_segments(1), EDGE_CASES])
+    clipped, mask = batch(segments, window)
+    for (p1, p2), line, keep in zip(segments, clipped, mask):
+        expected = scalar(tuple(p1), tuple(p2), window)
+        assert keep == bool(expected)
+        if expected:
+            np.testing.assert_allclose(line, expected, atol=1e-7)
+        else:
+            assert np.isnan(line).all()
+
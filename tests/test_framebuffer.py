@@ -0,0 +1,49 @@
+import io
+import struct
+import zlib
+import numpy as np
+from src.Framebuffer import Framebuffer, hex_to_rgb
+from src.Renderer import Primitive
+
+BACKGROUND = "#102030"
+
+def test_png_round_trip():
+    framebuffer = Framebuffer(13, 7, BACKGROUND)
+    framebuffer.pixels[:] = np.random.default_rng(0).integers(0, 256, framebuffer.pixels.shape, dtype=np.uint8)
+    stream = io.BytesIO()
+    framebuffer.save_png(stream)
+    data = stream.getvalue()
+
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    chunks, pos = {}, 8
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        assert struct.unpack(">I", data[pos + 8 + length:pos + 12 + length])[0] == zlib.crc32(kind + body)
+        chunks[kind] = body
+        pos += 12 + length
+    assert list(chunks) == [b"IHDR", b"IDAT", b"IEND"]
+    assert struct.unpack(">IIBBBBB", chunks[b"IHDR"]) == (13, 7, 8, 2, 0, 0, 0)
+
+    rows = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(7, 1 + 13 * 3)
+    assert (rows[:, 0] == 0).all()
+    np.testing.assert_array_equal(rows[:, 1:].reshape(7, 13, 3), framebuffer.pixels)
+
+def test_axis_aligned_lines_cover_exact_pixels():
+    framebuffer = Framebuffer(12, 10, BACKGROUND)
+    framebuffer.draw_lines([[2, 3, 9, 3], [5, 8, 5, 1]], "#ff0000")
+    expected = np.zeros((10, 12), dtype=bool)
+    expected[3, 2:10] = True
+    expected[1:9, 5] = True
+    red = (framebuffer.pixels == hex_to_rgb("#ff0000")).all(axis=2)
+    background = (framebuffer.pixels == hex_to_rgb(BACKGROUND)).all(axis=2)
+    np.testing.assert_array_equal(red, expected)
+    np.testing.assert_array_equal(background, ~expected)
+
+def test_draw_batches_polylines_like_draw_lines():
+    polylines = [[(1, 1), (10, 1), (10, 8)], [2, 7, 6, 3]]
+    batched = Framebuffer(12, 10, BACKGROUND)
+    batched.draw([Primitive(1, "lines", polylines, {"fill": "#00ff00", "width": 1})])
+    direct = Framebuffer(12, 10, BACKGROUND)
+    direct.draw_lines([[1, 1, 10, 1], [10, 1, 10, 8], [2, 7, 6, 3]], "#00ff00")
+    np.testing.assert_array_equal(batched.pixels, direct.pixels)
@@ -0,0 +1,112 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+import src.OBJHandler as obj_handler
+from src.OBJHandler import OBJHandler
+from src.Objeto3D import unique_edges
+from src.SceneCache import cache_path
+
+def write_scene(path, objects=6, vertices=40, seed=0):
+    # objetos com arestas, faces e indices relativos (negativos)
+    rng = np.random.default_rng(seed)
+    lines = []
+    for k in range(objects):
+        lines.append(f"o part_{k}")
+        lines += ["v %.6f %.6f %.6f" % tuple(v) for v in rng.uniform(-10, 10, (vertices, 3))]
+        base = k * vertices + 1
+        lines += [f"f {a} {a + 1} {a + 2}" for a in range(base, base + vertices - 2, 3)]
+        lines += [f"l {a} {a + 1}" for a in range(base + 1, base + vertices - 1, 4)]
+        lines += ["l -1 -2", "f -3 -2 -1"]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+def scene_arrays(display_file):
+    return [(obj.name, np.asarray(obj.vertices), np.asarray(obj.edges),
+             np.asarray(obj.face_vertices), np.asarray(obj.face_offsets)) for obj in display_file.objects]
+
+def assert_same_scene(a, b):
+    a, b = scene_arrays(a), scene_arrays(b)
+    assert [entry[0] for entry in a] == [entry[0] for entry in b]
+    for left, right in zip(a, b):
+        for x, y in zip(left[1:], right[1:]):
+            np.testing.assert_array_equal(x, y)
+
+def test_cache_round_trip(tmp_path):
+    filename = write_scene(tmp_path / "scene.obj")
+    parsed = OBJHandler.load_from_obj(filename, use_cache=True)
+    assert os.path.exists(cache_path(filename, "scene"))
+    cached = OBJHandler.load_from_obj(filename, use_cache=True)
+    assert isinstance(cached.objects[0].vertices, np.memmap)
+    assert_same_scene(cached, parsed)
+
+def test_cache_detects_changed_source(tmp_path):
+    path = tmp_path / "scene.obj"
+    filename = write_scene(path, seed=0)
+    OBJHandler.load_from_obj(filename, use_cache=True)
+
+    # mesmo tamanho, conteudo diferente e mtime diferente: so o hash denuncia
+    text = path.read_text()
+    digit = next(i for i in range(text.index("\nv ") + 3, len(text)) if text[i].isdigit())
+    path.write_text(text[:digit] + str((int(text[digit]) + 1) % 10) + text[digit + 1:])
+    stat = os.stat(filename)
+    assert stat.st_size == len(text)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert_same_scene(OBJHandler.load_from_obj(filename, use_cache=True), OBJHandler.load_from_obj(filename))
+
+    # tamanho diferente
+    write_scene(path, objects=3)
+    assert_same_scene(OBJHandler.load_from_obj(filename, use_cache=True), OBJHandler.load_from_obj(filename))
+
+def test_corrupt_cache_is_ignored(tmp_path):
+    filename = write_scene(tmp_path / "scene.obj")
+    OBJHandler.load_from_obj(filename, use_cache=True)
+    with open(cache_path(filename, "scene"), "r+b") as f:
+        f.write(b"garbage!")
+    assert_same_scene(OBJHandler.load_from_obj(filename, use_cache=True), OBJHandler.load_from_obj(filename))
+
+def test_vertices_cache(tmp_path):
+    filename = write_scene(tmp_path / "scene.obj")
+    parsed = OBJHandler.load_vertices(filename, use_cache=True)
+    assert parsed.shape == (6 * 40, 3)
+    np.testing.assert_array_equal(OBJHandler.load_vertices(filename, use_cache=True), parsed)
+
+@pytest.mark.parametrize("chunk_bytes", [64, 333, 4096])
+def test_parallel_parse_matches_serial(tmp_path, monkeypatch, chunk_bytes):
+    # faixas pequenas cortam objetos, faces e indices relativos entre faixas
+    filename = write_scene(tmp_path / "scene.obj")
+    serial = OBJHandler.load_from_obj(filename)
+    monkeypatch.setattr(obj_handler, "PARSE_CHUNK_BYTES", chunk_bytes)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        assert len(OBJHandler._chunk_ranges(filename, executor)) > 1
+        parallel = OBJHandler.load_from_obj(filename, executor=executor)
+        vertices = OBJHandler.load_vertices(filename, executor=executor)
+    assert_same_scene(parallel, serial)
+    np.testing.assert_array_equal(vertices, OBJHandler.load_vertices(filename))
+
+def test_export_round_trip_with_faces_and_loose_edges(tmp_path):
+    # faces de tamanhos misturados (com sequencias repetidas), arestas soltas e
+    # arestas 'l' que repetem lados de faces
+    rng = np.random.default_rng(7)
+    lines = ["o mesh"] + ["v %.6f %.6f %.6f" % tuple(v) for v in rng.uniform(-5, 5, (14, 3))]
+    lines += ["f 1 2 3", "f 2 3 4", "f 4 5 6 7", "f 7 8 9 10 11", "f 1 3 5", "f 5 6 8 9",
+              "l 11 12", "l 12 13 14", "l 1 2", "o wire"]
+    lines += ["v %.6f %.6f %.6f" % tuple(v) for v in rng.uniform(-5, 5, (3, 3))] + ["l 15 16 17"]
+    source = tmp_path / "source.obj"
+    source.write_text("\n".join(lines) + "\n")
+
+    loaded = OBJHandler.load_from_obj(str(source))
+    exported = tmp_path / "exported.obj"
+    OBJHandler.save_to_obj(loaded, str(exported))
+    text = exported.read_text()
+    assert text.count("\nf ") == 6
+    assert "l 1 2\n" not in text  # lado de face: nao vira registro 'l'
+
+    reloaded = OBJHandler.load_from_obj(str(exported))
+    assert [obj.name for obj in reloaded.objects] == ["mesh", "wire"]
+    for before, after in zip(loaded.objects, reloaded.objects):
+        np.testing.assert_array_equal(after.vertices, before.vertices)
+        np.testing.assert_array_equal(after.face_offsets, before.face_offsets)
+        np.testing.assert_array_equal(after.face_vertices, before.face_vertices)
+        np.testing.assert_array_equal(unique_edges(after.edges), unique_edges(before.edges))
+    assert np.diff(loaded.objects[0].face_offsets).tolist() == [3, 3, 4, 5, 3, 4]
@@ -0,0 +1,41 @@
+import pytest
+from benchmarks import scenes
+from src.Renderer import Renderer, Camera
+from src.FrameStats import FrameStats
+from src.Window import Window
+from src.Viewport import Viewport
+
+@pytest.mark.parametrize("algorithm", ["CS", "LB"])
+@pytest.mark.parametrize("bounds", [(-500, -500, 500, 500), (-100, -300, 200, 100), (-3000, -3000, 3000, 3000)])
+def test_segment_counters_add_up(algorithm, bounds):
+    scene = scenes.mixed_scene(500)
+    stats = FrameStats()
+    stats.begin_frame()
+    Renderer(algorithm, stats=stats).render(scene, Window(*bounds), Viewport(0, 0, 800, 800), Camera())
+    stats.end_frame()
+    counters = stats.counters
+    assert counters["segments.culled"] + counters["segments.considered"] == scene.segment_total
+    assert counters["segments.clipped"] + counters["segments.drawn"] == counters["segments.considered"]
+    assert min(counters["segments.clipped"], counters["segments.drawn"]) >= 0
+
+@pytest.mark.parametrize("bounds", [(-500, -500, 500, 500), (-100, -300, 200, 100)])
+def test_segment_counters_add_up_with_adaptive_tessellation(bounds):
+    scene = scenes.mixed_scene(200)
+    stats = FrameStats()
+    stats.begin_frame()
+    Renderer("CS", adaptive=True, stats=stats).render(scene, Window(*bounds), Viewport(0, 0, 800, 800), Camera())
+    stats.end_frame()
+    counters = stats.counters
+    assert counters["segments.culled"] + counters["segments.considered"] == scene.segment_total
+    assert counters["segments.clipped"] + counters["segments.drawn"] == counters["segments.considered"]
+    assert counters["segments.tessellated"] > 0
+
+def test_segment_counters_off_unless_detailed():
+    scene = scenes.mixed_scene(50)
+    stats = FrameStats()
+    stats.detailed = False
+    stats.begin_frame()
+    Renderer("LB", stats=stats).render(scene, Window(-100, -300, 200, 100), Viewport(0, 0, 800, 800), Camera())
+    stats.end_frame()
+    assert stats.counters["objects"] == len(scene)
+    assert not any(name.startswith("segments.") for name in stats.counters)
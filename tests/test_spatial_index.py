@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from src.DisplayFile import DisplayFile
+from src.Line import Line
+from src.Wireframe import Wireframe
+from src.Objeto3D import Objeto3D
+from src.Window import Window
+from src.SpatialIndex import window_bounds, overlaps
+from src.Transformations import view_transform_matrix, perspective_matrix
+
+def build_scene(seed=0):
+    rng = np.random.default_rng(seed)
+    scene = DisplayFile()
+    for i, (a, b) in enumerate(rng.uniform(-2000, 2000, (400, 2, 2)).tolist()):
+        scene.add_object(Line(f"line_{i}", [tuple(a), tuple(b)]))
+    # caixas grandes o bastante para ficar fora da grade (MAX_CELLS)
+    for i in range(3):
+        scene.add_object(Wireframe(f"big_{i}", [tuple(p) for p in rng.uniform(-5000, 5000, (6, 2)).tolist()]))
+    for i in range(40):
+        obj = Objeto3D(f"mesh_{i}")
+        center = rng.uniform(-1500, 1500, 3)
+        obj.set_geometry(center + rng.uniform(-60, 60, (12, 3)), [[k, k + 1] for k in range(11)])
+        scene.add_object(obj)
+    return scene, rng
+
+def moved(scene, rng):
+    # transforma e remove alguns objetos; o indice tem de acompanhar
+    for obj in scene.objects[::7]:
+        dx, dy = rng.uniform(-800, 800, 2)
+        if isinstance(obj, Objeto3D):
+            obj.apply_transformation(np.array([[1, 0, 0, dx], [0, 1, 0, dy], [0, 0, 1, 0], [0, 0, 0, 1]], dtype=float))
+        else:
+            obj.apply_transformation(np.array([[1, 0, dx], [0, 1, dy], [0, 0, 1]], dtype=float))
+        scene.update_object(obj)
+    for obj in scene.objects[3::11]:
+        scene.remove_object(obj)
+    return scene
+
+def windows():
+    result = []
+    for x, y, half, angle in [(0, 0, 500, 0), (900, -400, 250, 0), (-300, 200, 400, 35), (0, 0, 6000, 0)]:
+        window = Window(x - half, y - half, x + half, y + half)
+        window.set_angle(angle)
+        result.append(window)
+    return result
+
+def projected_overlap(obj, matrix, bounds, perspective):
+    # forca bruta: todos os vertices projetados, caixa 2D contra a window
+    projected = obj.vertices @ matrix.T
+    if perspective:
+        if (projected[:, 3] <= 0).any():
+            return True
+        projected = projected / projected[:, 3:]
+    lo, hi = projected[:, :2].min(axis=0), projected[:, :2].max(axis=0)
+    return overlaps((lo[0], lo[1], hi[0], hi[1]), bounds)
+
+@pytest.mark.parametrize("window", windows())
+@pytest.mark.parametrize("perspective", [False, True])
+def test_query_matches_brute_force(window, perspective):
+    scene = moved(*build_scene())
+    bounds = window_bounds(window)
+    matrix = view_transform_matrix([0, 0, 2000], [0, 0, 1], [0, 1, 0])
+    if perspective:
+        matrix = perspective_matrix(1000.0) @ matrix
+    result = scene.query(bounds, matrix, perspective)
+
+    assert result == [obj for obj in scene.objects if obj in result]  # ordem de insercao
+    flat = [obj for obj in scene.objects if not isinstance(obj, Objeto3D)]
+    assert [obj for obj in result if not isinstance(obj, Objeto3D)] == \
+        [obj for obj in flat if overlaps(obj.get_bounds(), bounds)]
+    for obj in scene.objects:
+        if isinstance(obj, Objeto3D) and projected_overlap(obj, matrix, bounds, perspective):
+            assert obj in result
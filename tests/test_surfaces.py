@@ -0,0 +1,88 @@
+import numpy as np
+from math import comb
+from concurrent.futures import ThreadPoolExecutor
+from src.BicubicSurface import BicubicSurface
+from src.BSplineSurface import BSplineSurface
+
+def bernstein(t):
+    return np.array([comb(3, i) * t ** i * (1 - t) ** (3 - i) for i in range(4)])
+
+def random_patches(seed, count):
+    return np.random.default_rng(seed).uniform(-50, 50, size=(count, 16, 3))
+
+def test_bicubic_grid_matches_bernstein_evaluation():
+    patches = random_patches(1, 3)
+    surface = BicubicSurface("s")
+    surface.steps = 6
+    surface.add_patches(patches)
+
+    n = surface.steps + 1
+    ts = np.linspace(0, 1, n)
+    grids = surface.vertices[:, :3].reshape(len(patches), n, n, 3)
+    for grid, points in zip(grids, patches):
+        G = points.reshape(4, 4, 3)
+        expected = np.array([[np.einsum("i,j,ijk->k", bernstein(s), bernstein(t), G) for t in ts] for s in ts])
+        np.testing.assert_allclose(grid, expected, atol=1e-9)
+
+def bspline_basis(t):
+    return np.array([(1 - t) ** 3, 3 * t ** 3 - 6 * t ** 2 + 4, -3 * t ** 3 + 3 * t ** 2 + 3 * t + 1, t ** 3]) / 6
+
+def test_bspline_shared_grid_matches_direct_evaluation():
+    grid = np.random.default_rng(3).uniform(-50, 50, size=(7, 6, 3))
+    steps = 4
+    surface = BSplineSurface("s")
+    surface.steps = steps
+    surface.set_control_points(grid.tolist())
+
+    rows, cols = (len(grid) - 3) * steps + 1, (grid.shape[1] - 3) * steps + 1
+    assert len(surface.vertices) == rows * cols
+    assert len(surface.edges) == rows * (cols - 1) + cols * (rows - 1)
+    points = surface.vertices[:, :3].reshape(rows, cols, 3)
+    for i in range(rows):
+        for j in range(cols):
+            r, s = min(i // steps, len(grid) - 4), i / steps - min(i // steps, len(grid) - 4)
+            c, t = min(j // steps, grid.shape[1] - 4), j / steps - min(j // steps, grid.shape[1] - 4)
+            G = grid[r:r + 4, c:c + 4]
+            expected = np.einsum("i,j,ijk->k", bspline_basis(s), bspline_basis(t), G)
+            np.testing.assert_allclose(points[i, j], expected, atol=1e-9)
+
+def test_bspline_executor_matches_serial():
+    grid = np.random.default_rng(4).uniform(-50, 50, size=(12, 9, 3)).tolist()
+    serial = BSplineSurface("serial")
+    serial.set_control_points(grid)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        parallel = BSplineSurface("parallel")
+        parallel.set_control_points(grid, executor=executor)
+    np.testing.assert_allclose(parallel.vertices, serial.vertices, atol=1e-9)
+    np.testing.assert_array_equal(parallel.edges, serial.edges)
+
+def test_set_patch_rebuilds_only_its_block(monkeypatch):
+    patches = random_patches(5, 4)
+    surface = BicubicSurface("s")
+    surface.add_patches(patches)
+    block = (surface.steps + 1) ** 2
+    before = surface.vertices.copy()
+
+    tessellated = []
+    original = surface._tessellate
+    monkeypatch.setattr(surface, "_tessellate", lambda cp: tessellated.append(len(cp)) or original(cp))
+    surface.set_patch(2, [tuple(p) for p in (patches[2] + 10.0).tolist()])
+
+    assert tessellated == [1]
+    changed = ~np.isclose(surface.vertices, before).all(axis=1)
+    assert changed[2 * block:3 * block].all()
+    assert not changed[:2 * block].any() and not changed[3 * block:].any()
+
+    reference = BicubicSurface("r")
+    reference.add_patches(np.concatenate([patches[:2], patches[2:3] + 10.0, patches[3:]]))
+    np.testing.assert_allclose(surface.vertices, reference.vertices)
+
+def test_generate_mesh_picks_up_edits_through_patches():
+    surface = BicubicSurface("s")
+    surface.add_patches(random_patches(6, 2))
+    for p in surface.patches[0]:
+        p.x += 100
+    surface.generate_mesh()
+    reference = BicubicSurface("r")
+    reference.add_patches(surface.control_points[:, :, :3].copy())
+    np.testing.assert_allclose(surface.vertices, reference.vertices)